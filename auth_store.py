@@ -1,41 +1,214 @@
-import os, json, re, secrets, hashlib, time, hmac, tempfile
+import os, json, re, secrets, hashlib, time, hmac, tempfile, functools, struct
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-MOBILE_RE = re.compile(r"^[0-9]{10}$")
+# Optional OpenSSL PBKDF2 via `cryptography`; falls back to hashlib.pbkdf2_hmac.
+try:
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+    _HAS_CRYPTOGRAPHY = True
+except Exception:
+    _HAS_CRYPTOGRAPHY = False
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+PIN_ITERATIONS = 120_000
+
+# Login throttle: MAX_FAILED_ATTEMPTS wrong PINs -> LOCKOUT_SECONDS cool-off.
+MAX_FAILED_ATTEMPTS = 5
+LOCKOUT_SECONDS = 300
+
+# PBKDF2 digest used for new hashes; recorded per account as "kdf" so older
+# records keep verifying if this ever changes. Records without it are sha256.
+_HASH_ALGO = "sha256"
+_DEFAULT_KDF = "sha256"
+_KDF_DIGEST_SIZE = {"sha256": 32, "sha512": 64}
+_KDF_IDS = {"sha256": 0, "sha512": 1}
+_KDF_NAMES = {v: k for k, v in _KDF_IDS.items()}
+
+# auth.bin: one fixed-size little-endian record, sliced with struct instead of parsed.
+#   version, mobile (ascii), kdf id, salt, hash (zero-padded to 64), created_at,
+#   updated_at, failed_attempts, last_failed_at
+_AUTH_FMT = "<B10sB16s64sIIBI"
+_AUTH_SIZE = struct.calcsize(_AUTH_FMT)
+_AUTH_VERSION = 1
+
+# Deletes every Latin-1 non-digit in one C-level pass (cheaper than re.sub).
+_KEEP_DIGITS = str.maketrans("", "", "".join(chr(c) for c in range(256) if not 0x30 <= c <= 0x39))
+
+# path -> ((mtime_ns, size), parsed) for files read or written by this process
+_PARSED_CACHE: dict[str, tuple[tuple[int, int], dict]] = {}
+
+def is_mobile(s: str) -> bool:
+    """True for exactly 10 ASCII digits; str methods instead of a ^[0-9]{10}$ regex."""
+    return len(s) == 10 and s.isascii() and s.isdigit()
 
 def _now() -> int:
     return int(time.time())
 
-def _atomic_write_json(path: str, data: dict) -> None:
+def _read_cached(path: str, parse) -> dict:
+    """Parse a file with `parse(bytes)`, reusing the last result while its mtime/size are unchanged.
+
+    Returns a shallow copy so callers can mutate it freely.
+    Raises OSError if the file is missing and ValueError if it does not parse.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _PARSED_CACHE.get(path)
+    if hit and hit[0] == key:
+        return dict(hit[1])
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = parse(raw)
+    _PARSED_CACHE[path] = (key, data)
+    return dict(data)
+
+def loads_json(raw: bytes) -> dict:
+    return (orjson.loads(raw) if orjson is not None else json.loads(raw)) or {}
+
+def read_json_cached(path: str) -> dict:
+    return _read_cached(path, loads_json)
+
+def _pack_auth(u: dict) -> bytes:
+    """Auth dict -> auth.bin record. ValueError if a field doesn't fit the fixed layout."""
+    kdf = u.get("kdf", _DEFAULT_KDF)
+    mob = u.get("mobile", "")
+    if kdf not in _KDF_IDS or not isinstance(mob, str) or not is_mobile(mob):
+        raise ValueError("Auth record does not fit auth.bin.")
+    try:
+        salt = bytes.fromhex(u.get("pin_salt", ""))
+        digest = bytes.fromhex(u.get("pin_hash", ""))
+        if len(salt) != 16 or len(digest) != _KDF_DIGEST_SIZE[kdf]:
+            raise ValueError("Auth record does not fit auth.bin.")
+        return struct.pack(_AUTH_FMT, _AUTH_VERSION, mob.encode("ascii"), _KDF_IDS[kdf], salt, digest,
+                           int(u.get("created_at", 0)), int(u.get("updated_at", 0)),
+                           min(int(u.get("failed_attempts", 0)), 255), int(u.get("last_failed_at", 0)))
+    except (TypeError, struct.error) as e:
+        raise ValueError(f"Auth record does not fit auth.bin: {e}")
+
+def _unpack_auth(raw: bytes) -> dict:
+    """auth.bin record -> the same dict shape auth.json used."""
+    if len(raw) != _AUTH_SIZE:
+        raise ValueError("Corrupted auth record.")
+    ver, mob, kdf_id, salt, digest, created, updated, fails, last = struct.unpack(_AUTH_FMT, raw)
+    if ver != _AUTH_VERSION or kdf_id not in _KDF_NAMES:
+        raise ValueError("Corrupted auth record.")
+    kdf = _KDF_NAMES[kdf_id]
+    u = {
+        "mobile": mob.decode("ascii"),
+        "kdf": kdf,
+        "pin_salt": salt.hex(),
+        "pin_hash": digest[:_KDF_DIGEST_SIZE[kdf]].hex(),
+        "created_at": created,
+        "updated_at": updated,
+    }
+    if fails:
+        u["failed_attempts"] = fails
+        u["last_failed_at"] = last
+    return u
+
+def dumps_json(data: dict, *, pretty: bool = False) -> bytes:
+    if orjson is not None:
+        opt = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=opt)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def atomic_write_json(path: str, data: dict, *, pretty: bool = False, fsync: bool = True) -> None:
+    """Write JSON via tmpfile + fsync + os.replace. Compact unless `pretty` (human-read files)."""
+    atomic_write_bytes(path, dumps_json(data, pretty=pretty), data, fsync=fsync)
+
+def atomic_write_bytes(path: str, payload: bytes, parsed: Optional[dict] = None, *,
+                       fsync: bool = True) -> None:
+    """Atomically replace `path` with `payload`; `parsed` (its decoded form) primes the read cache.
+
+    fsync=False still survives a process kill (the rename is atomic), just not a power loss.
+    """
     d = os.path.dirname(path)
-    os.makedirs(d, exist_ok=True)
     fd = None
     tmp = None
+    replaced = False
     try:
-        fd, tmp = tempfile.mkstemp(prefix=".tmp_", dir=d, text=True)
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        buf = memoryview(payload)
+        try:
+            fd, tmp = tempfile.mkstemp(prefix=".tmp_", dir=d)
+        except FileNotFoundError:  # first write into this dir
+            os.makedirs(d, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".tmp_", dir=d)
+        while buf:
+            buf = buf[os.write(fd, buf):]
+        if fsync:
+            os.fsync(fd)
+        os.close(fd)
+        fd = None
         os.replace(tmp, path)
+        replaced = True
+        if parsed is not None:
+            st = os.stat(path)
+            _PARSED_CACHE[path] = ((st.st_mtime_ns, st.st_size), dict(parsed))
     finally:
-        try:
-            if tmp and os.path.exists(tmp):
-                os.remove(tmp)
-        except Exception:
-            pass
+        if fd is not None:
+            os.close(fd)
+        if tmp and not replaced:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+def strip_non_digits(s: str) -> str:
+    x = (s or "").translate(_KEEP_DIGITS)
+    if not x.isascii():  # rare: non-Latin-1 input, use the exact slow path
+        x = re.sub(r"\D", "", x)
+    return x
 
 def _normalize_mobile(mobile: str) -> str:
-    x = re.sub(r"\D", "", (mobile or "").strip())
-    if not MOBILE_RE.fullmatch(x):
+    x = strip_non_digits((mobile or "").strip())
+    if not is_mobile(x):
         raise ValueError("Enter a valid 10-digit mobile number.")
     return x
 
-def _hash_pin(pin: str, *, salt: Optional[str] = None) -> tuple[str, str]:
-    if not re.fullmatch(r"[0-9]{4,6}", pin or ""):
+@functools.lru_cache(maxsize=1024)
+def _compute_user_dir(users_root: str, mob: str) -> str:
+    return os.path.join(users_root, mob)
+
+@functools.lru_cache(maxsize=1024)
+def _compute_auth_path(users_root: str, mob: str) -> str:
+    return os.path.join(users_root, mob, "auth.bin")
+
+@functools.lru_cache(maxsize=1024)
+def _compute_auth_json_path(users_root: str, mob: str) -> str:
+    # pre-auth.bin records, and any record that doesn't fit the fixed layout
+    return os.path.join(users_root, mob, "auth.json")
+
+def _hash_pin(pin: str, *, salt: Optional[str] = None, algo: str = _HASH_ALGO) -> tuple[str, str]:
+    p = pin or ""
+    if not 4 <= len(p) <= 6 or not p.isascii() or not p.isdigit():
         raise ValueError("PIN must be 4–6 digits.")
+    if algo not in _KDF_DIGEST_SIZE:
+        raise ValueError("Unsupported PIN hash.")
     salt = salt or secrets.token_hex(16)
-    dk = hashlib.pbkdf2_hmac("sha256", pin.encode("utf-8"), bytes.fromhex(salt), 120_000)
+    if _HAS_CRYPTOGRAPHY:
+        alg = hashes.SHA512() if algo == "sha512" else hashes.SHA256()
+        kdf = PBKDF2HMAC(algorithm=alg, length=_KDF_DIGEST_SIZE[algo],
+                         salt=bytes.fromhex(salt), iterations=PIN_ITERATIONS)
+        dk = kdf.derive(pin.encode("utf-8"))
+    else:
+        dk = hashlib.pbkdf2_hmac(algo, pin.encode("utf-8"), bytes.fromhex(salt), PIN_ITERATIONS)
     return salt, dk.hex()
 
+def _hash_pin_worker(job: tuple[str, str, str, str]) -> bool:
+    """(salt, expected_hash, kdf, pin) -> match. PBKDF2 releases the GIL, so threads scale."""
+    salt, expect, algo, pin = job
+    try:
+        _, got = _hash_pin(pin, salt=salt, algo=algo)
+    except ValueError:
+        return False
+    return hmac.compare_digest(got, expect)
+
 class AuthStore:
     """
     Per-user auth layout (mobile is the ONLY primary key):
@@ -43,7 +216,8 @@ class AuthStore:
       base_dir/
         users/
           <mobile>/
-            auth.json     # credentials ONLY (mobile, pin_salt, pin_hash, timestamps, throttle)
+            auth.bin      # credentials ONLY (mobile, kdf, pin_salt, pin_hash, timestamps, throttle)
+                          # fixed struct record, see _AUTH_FMT; older auth.json is converted on load
             profile.json  # user data (LocalStore handles this)
             uploads/      # media (LocalStore handles this)
         session.json      # current signed-in mobile
@@ -56,6 +230,10 @@ class AuthStore:
         self.users_root = os.path.join(self.base_dir, "users")
         os.makedirs(self.users_root, exist_ok=True)
         self.session_path = os.path.join(self.base_dir, "session.json")
+        # ((mtime_ns, size), user) for session.json; see current_user()
+        self._session_cache: Optional[tuple[tuple[int, int], dict]] = None
+        # PBKDF2 workers for verify_pins_bulk, created on first use and reused
+        self._hash_pool: Optional[ThreadPoolExecutor] = None
 
         # ---- optional migration from legacy map ----
         legacy_dir = os.path.join(base_dir, "auth")
@@ -67,11 +245,11 @@ class AuthStore:
                 users_map = db.get("users_by_mobile") or {}
                 if isinstance(users_map, dict):
                     for mob, rec in users_map.items():
-                        mobn = re.sub(r"\D", "", (mob or ""))
-                        if not MOBILE_RE.fullmatch(mobn):
+                        mobn = strip_non_digits(mob)
+                        if not is_mobile(mobn):
+                            continue
+                        if self._auth_exists(mobn):  # never clobber a newer per-user record
                             continue
-                        udir = os.path.join(self.users_root, mobn)
-                        os.makedirs(udir, exist_ok=True)
                         payload = {
                             "mobile": mobn,
                             "pin_salt": rec.get("pin_salt", ""),
@@ -79,40 +257,78 @@ class AuthStore:
                             "created_at": rec.get("created_at", _now()),
                             "updated_at": rec.get("updated_at", _now()),
                         }
-                        _atomic_write_json(os.path.join(udir, "auth.json"), payload)
-                # Keep legacy file as-is; comment next line to preserve it.
-                # os.rename(legacy_map, legacy_map + ".migrated")
+                        self._save_auth(mobn, payload)
+                    # Migrate once: later startups skip the loop entirely.
+                    os.replace(legacy_map, legacy_map + ".migrated")
             except Exception:
                 pass
 
-    # ---- paths ----
-    def _user_dir(self, mobile: str) -> str:
-        return os.path.join(self.users_root, _normalize_mobile(mobile))
+    # ---- auth records (mob must already be normalized) ----
+    def _auth_exists(self, mob: str) -> bool:
+        return (os.path.exists(_compute_auth_path(self.users_root, mob))
+                or os.path.exists(_compute_auth_json_path(self.users_root, mob)))
 
-    def _auth_path(self, mobile: str) -> str:
-        return os.path.join(self._user_dir(mobile), "auth.json")
+    def _load_auth(self, mob: str) -> Optional[dict]:
+        """Auth record, or None if the user has none. Raises ValueError if it is corrupt.
+
+        A pre-binary auth.json is rewritten as auth.bin the first time it is loaded, if it
+        fits the fixed layout; otherwise it is left as JSON and never rewritten on read.
+        """
+        try:
+            return _read_cached(_compute_auth_path(self.users_root, mob), _unpack_auth)
+        except FileNotFoundError:
+            pass
+        jp = _compute_auth_json_path(self.users_root, mob)
+        try:
+            u = read_json_cached(jp)
+        except FileNotFoundError:
+            return None
+        try:
+            buf = _pack_auth(u)
+        except ValueError:
+            return u  # doesn't fit auth.bin (e.g. legacy salt size): stays JSON, no rewrite
+        try:
+            atomic_write_bytes(_compute_auth_path(self.users_root, mob), buf, _unpack_auth(buf))
+            os.unlink(jp)
+        except OSError:
+            pass
+        return u
+
+    def _save_auth(self, mob: str, u: dict, *, fsync: bool = True) -> bool:
+        """Persist an auth record; True if it went to auth.bin, False if it had to stay JSON."""
+        try:
+            buf = _pack_auth(u)
+        except ValueError:
+            # e.g. a legacy salt that isn't 16 bytes: keep the record readable as JSON
+            atomic_write_json(_compute_auth_json_path(self.users_root, mob), u, fsync=fsync)
+            return False
+        atomic_write_bytes(_compute_auth_path(self.users_root, mob), buf, _unpack_auth(buf),
+                           fsync=fsync)
+        try:  # superseded JSON record, if any
+            os.unlink(_compute_auth_json_path(self.users_root, mob))
+        except FileNotFoundError:
+            pass
+        return True
 
     # ---- public API ----
     def register(self, mobile: str, pin: str) -> dict:
         """Create/update user keyed ONLY by mobile."""
         mob = _normalize_mobile(mobile)
-        udir = self._user_dir(mob)
+        udir = _compute_user_dir(self.users_root, mob)
         os.makedirs(udir, exist_ok=True)
-        ap = self._auth_path(mob)
 
         now = _now()
-        if os.path.exists(ap):
-            try:
-                with open(ap, "r", encoding="utf-8") as f:
-                    u = json.load(f) or {}
-            except Exception:
-                u = {}
-        else:
+        try:
+            u = self._load_auth(mob)
+        except Exception:
+            u = {}
+        if u is None:
             u = {"mobile": mob, "created_at": now}
 
         salt, pin_hash = _hash_pin(pin)
         u.update({
             "mobile": mob,
+            "kdf": _HASH_ALGO,
             "pin_salt": salt,
             "pin_hash": pin_hash,
             "updated_at": now,
@@ -121,26 +337,23 @@ class AuthStore:
         u.pop("failed_attempts", None)
         u.pop("last_failed_at", None)
 
-        _atomic_write_json(ap, u)
+        self._save_auth(mob, u)
         return {"mobile": mob}
 
     def login(self, mobile: str, pin: str) -> dict:
         mob = _normalize_mobile(mobile)
-        ap = self._auth_path(mob)
-        if not os.path.exists(ap):
-            raise ValueError("Account not found. Please register.")
-
         try:
-            with open(ap, "r", encoding="utf-8") as f:
-                u = json.load(f) or {}
+            u = self._load_auth(mob)
         except Exception:
             raise ValueError("Corrupted account. Recreate the user.")
+        if u is None:
+            raise ValueError("Account not found. Please register.")
 
         # Throttle (5 failures -> 5 min cool-off)
         now = _now()
         fails = int(u.get("failed_attempts", 0))
         last = int(u.get("last_failed_at", 0))
-        if fails >= 5 and now - last < 300:
+        if fails >= MAX_FAILED_ATTEMPTS and now - last < LOCKOUT_SECONDS:
             raise ValueError("Too many attempts. Try again in a few minutes.")
 
         salt = u.get("pin_salt", "")
@@ -148,24 +361,28 @@ class AuthStore:
         if not (salt and expect):
             raise ValueError("Account not initialized properly.")
 
-        _, got = _hash_pin(pin, salt=salt)
+        _, got = _hash_pin(pin, salt=salt, algo=u.get("kdf", _DEFAULT_KDF))
         if not hmac.compare_digest(got, expect):
+            # Every failure reaches auth.bin so a killed/restarted process can't reset
+            # the count; only the lockout write pays for an fsync.
             u["failed_attempts"] = fails + 1
             u["last_failed_at"] = now
-            _atomic_write_json(ap, u)
+            self._save_auth(mob, u, fsync=fails + 1 >= MAX_FAILED_ATTEMPTS)
             raise ValueError("Invalid PIN.")
 
         # Success -> clear throttling
         u.pop("failed_attempts", None)
         u.pop("last_failed_at", None)
         u["updated_at"] = now
-        _atomic_write_json(ap, u)
+        self._save_auth(mob, u)
 
         # Persist session as current mobile
-        _atomic_write_json(self.session_path, {"mobile": mob, "login_at": now})
+        atomic_write_json(self.session_path, {"mobile": mob, "login_at": now})
+        self._session_cache = None
         return {"mobile": mob}
 
     def logout(self) -> None:
+        self._session_cache = None
         try:
             if os.path.exists(self.session_path):
                 os.remove(self.session_path)
@@ -173,62 +390,104 @@ class AuthStore:
             pass
 
     def current_user(self) -> Optional[dict]:
-        if not os.path.exists(self.session_path):
+        # Called on every screen change; a stat is enough while session.json is unchanged.
+        try:
+            st = os.stat(self.session_path)
+        except OSError:
+            self._session_cache = None
             return None
+        key = (st.st_mtime_ns, st.st_size)
+        if self._session_cache and self._session_cache[0] == key:
+            return dict(self._session_cache[1])
         try:
-            with open(self.session_path, "r", encoding="utf-8") as f:
-                sess = json.load(f) or {}
+            sess = read_json_cached(self.session_path)
             mob = _normalize_mobile(sess.get("mobile", ""))
             # Return minimal user object (mobile only); main.py/LocalStore use this.
-            return {"mobile": mob}
+            user = {"mobile": mob}
         except Exception:
+            self._session_cache = None
             return None
+        self._session_cache = (key, user)
+        return dict(user)
     # --- add inside class AuthStore ---
 
     def user_exists(self, mobile: str) -> bool:
         try:
-            return os.path.exists(self._auth_path(mobile))
+            return self._auth_exists(_normalize_mobile(mobile))
         except Exception:
             return False
 
     def list_users(self) -> list[str]:
         out = []
         try:
-            for name in os.listdir(self.users_root):
-                if MOBILE_RE.fullmatch(name) and os.path.exists(os.path.join(self.users_root, name, "auth.json")):
-                    out.append(name)
-        except Exception:
+            with os.scandir(self.users_root) as it:
+                for e in it:
+                    n = e.name
+                    if not is_mobile(n):
+                        continue
+                    if not e.is_dir(follow_symlinks=False):
+                        continue
+                    if (os.path.exists(os.path.join(e.path, "auth.bin"))
+                            or os.path.exists(os.path.join(e.path, "auth.json"))):
+                        out.append(n)
+        except OSError:
             pass
         return sorted(out)
 
-    def verify_pin(self, mobile: str, pin: str) -> bool:
-        mob = _normalize_mobile(mobile)
-        ap = self._auth_path(mob)
-        if not os.path.exists(ap):
-            return False
-        with open(ap, "r", encoding="utf-8") as f:
-            u = json.load(f) or {}
+    @staticmethod
+    def _pin_matches(u: dict, pin: str) -> bool:
         salt, expect = u.get("pin_salt", ""), u.get("pin_hash", "")
         if not (salt and expect):
             return False
-        _, got = _hash_pin(pin, salt=salt)
+        _, got = _hash_pin(pin, salt=salt, algo=u.get("kdf", _DEFAULT_KDF))
         return hmac.compare_digest(got, expect)
 
+    def verify_pin(self, mobile: str, pin: str) -> bool:
+        u = self._load_auth(_normalize_mobile(mobile))
+        if u is None:
+            return False
+        return self._pin_matches(u, pin)
+
+    def verify_pins_bulk(self, pairs: list[tuple[str, str]]) -> list[bool]:
+        """verify_pin for many (mobile, pin) pairs, hashing in parallel across cores."""
+        results = [False] * len(pairs)
+        jobs: list[tuple[int, tuple[str, str, str, str]]] = []
+        for i, (mobile, pin) in enumerate(pairs):
+            try:
+                u = self._load_auth(_normalize_mobile(mobile))
+            except Exception:
+                continue
+            if u is None:
+                continue
+            salt, expect = u.get("pin_salt", ""), u.get("pin_hash", "")
+            if salt and expect:
+                jobs.append((i, (salt, expect, u.get("kdf", _DEFAULT_KDF), pin)))
+        if jobs:
+            if self._hash_pool is None:
+                self._hash_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                                     thread_name_prefix="pin-hash")
+            for (i, _), ok in zip(jobs, self._hash_pool.map(_hash_pin_worker, [j for _, j in jobs])):
+                results[i] = ok
+        return results
+
+    async def login_async(self, mobile: str, pin: str) -> dict:
+        """login() on a worker thread so an event loop stays responsive during PBKDF2."""
+        import asyncio  # only asyncio callers pay for the import
+        return await asyncio.to_thread(self.login, mobile, pin)
+
     def change_pin(self, mobile: str, old_pin: str, new_pin: str) -> None:
-        if not self.verify_pin(mobile, old_pin):
-            raise ValueError("Old PIN incorrect.")
         mob = _normalize_mobile(mobile)
-        ap = self._auth_path(mob)
-        with open(ap, "r", encoding="utf-8") as f:
-            u = json.load(f) or {}
+        u = self._load_auth(mob) or {}
+        if not self._pin_matches(u, old_pin):
+            raise ValueError("Old PIN incorrect.")
         salt, pin_hash = _hash_pin(new_pin)
-        u.update({"pin_salt": salt, "pin_hash": pin_hash, "updated_at": _now()})
-        _atomic_write_json(ap, u)
+        u.update({"kdf": _HASH_ALGO, "pin_salt": salt, "pin_hash": pin_hash, "updated_at": _now()})
+        self._save_auth(mob, u)
 
     def delete_user(self, mobile: str, *, archive: bool = True) -> bool:
         import shutil
         mob = _normalize_mobile(mobile)
-        udir = self._user_dir(mob)
+        udir = _compute_user_dir(self.users_root, mob)
         if not os.path.isdir(udir):
             return False
         if archive:
@@ -240,10 +499,10 @@ class AuthStore:
         # clear session if it belonged to this user
         try:
             if os.path.exists(self.session_path):
-                with open(self.session_path, "r", encoding="utf-8") as f:
-                    sess = json.load(f) or {}
+                sess = read_json_cached(self.session_path)
                 if _normalize_mobile(sess.get("mobile", "")) == mob:
                     os.remove(self.session_path)
+                    self._session_cache = None
         except Exception:
             pass
         return True
@@ -253,5 +512,6 @@ class AuthStore:
         mob = _normalize_mobile(mobile)
         if not self.user_exists(mob):
             raise ValueError("User not found.")
-        _atomic_write_json(self.session_path, {"mobile": mob, "login_at": _now()})
+        atomic_write_json(self.session_path, {"mobile": mob, "login_at": _now()})
+        self._session_cache = None
         return {"mobile": mob}
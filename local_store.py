@@ -1,13 +1,94 @@
-import os, re, json, time, shutil, glob
+import os, time, shutil, functools, threading
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+from auth_store import atomic_write_json, is_mobile, read_json_cached, strip_non_digits
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import sqlite3
+except ImportError:  # python built without _sqlite3 (buildozer.spec lists the recipe): sidecars only
+    sqlite3 = None
 
 ALLOWED_IMAGE_EXTS = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp'}
 ALLOWED_VIDEO_EXTS = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.3gp'}
+# ext (as found on disk, lower- or upper-case) -> media type; anything else is an image
+_EXT_TO_TYPE: Dict[str, str] = {}
+for _e in ALLOWED_IMAGE_EXTS:
+    _EXT_TO_TYPE[_e] = _EXT_TO_TYPE[_e.upper()] = "image"
+for _e in ALLOWED_VIDEO_EXTS:
+    _EXT_TO_TYPE[_e] = _EXT_TO_TYPE[_e.upper()] = "video"
+del _e
+
+# Per-user gallery metadata index (a cache of the sidecars, which stay authoritative)
+_META_DB = ".meta.sqlite"
+_META_SCHEMA = ("CREATE TABLE IF NOT EXISTS meta(path TEXT PRIMARY KEY, mtime REAL, size INTEGER, "
+                "desc TEXT, thumb TEXT, media_type TEXT)")
+
+_FICLONE = 0x40049409  # linux/fs.h: share extents copy-on-write (Btrfs, XFS, ...)
 
 def _date_key(ts: Optional[float] = None) -> str:
     return time.strftime("%Y%m%d", time.localtime(ts or time.time()))
 
+@functools.lru_cache(maxsize=1024)
+def _compute_user_path(users_root: str, mob: str, name: str) -> str:
+    return os.path.join(users_root, mob, name)
+
+def _kernel_copy(src_fd: int, dst_fd: int, size: int) -> bool:
+    """Copy `size` bytes without a userspace buffer; False if the kernel can't do it."""
+    if hasattr(os, "copy_file_range"):
+        copied = 0
+        try:
+            while copied < size:
+                n = os.copy_file_range(src_fd, dst_fd, size - copied)
+                if n == 0:
+                    break
+                copied += n
+            return copied == size
+        except OSError:
+            if copied:
+                raise
+    if hasattr(os, "sendfile"):
+        copied = 0
+        try:
+            while copied < size:
+                n = os.sendfile(dst_fd, src_fd, copied, size - copied)
+                if n == 0:
+                    break
+                copied += n
+            return copied == size
+        except OSError:
+            if copied:
+                raise
+    return False
+
+def _reflink(src: str, dst: str) -> bool:
+    """O(1) copy-on-write clone of src into dst; False if the filesystem can't."""
+    if fcntl is None:
+        return False
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    except OSError:
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+def _fast_copy(src: str, dst: str) -> None:
+    """Like shutil.copy2, preferring copy_file_range/sendfile over a read/write loop."""
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        if not _kernel_copy(fsrc.fileno(), fdst.fileno(), size):
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, 1 << 20)
+    shutil.copystat(src, dst)
+
 @dataclass
 class UploadRow:
     path: str
@@ -25,89 +106,89 @@ class LocalStore:
           <mobile>/
             profile.json
             uploads/
+              .counters.json   # {<YYYYMMDD>: last digit used}
+              .meta.sqlite     # sidecar index: filename -> sidecar mtime/size + desc/thumb/type
               <mobile>_<YYYYMMDD>_<digit>.<ext>
     """
     def __init__(self, base_dir: str):
         self.base_dir = base_dir
         self.users_root = os.path.join(base_dir, "users")
         os.makedirs(self.users_root, exist_ok=True)
+        # One long-lived connection per user: keeps the WAL files in place instead of
+        # creating/deleting them (and bumping the uploads dir mtime) on every open/close.
+        self._meta_dbs: Dict[str, "sqlite3.Connection"] = {}
+        self._meta_lock = threading.Lock()
 
     # ---------- helpers ----------
     def _norm_mobile(self, mobile: str) -> str:
-        m = re.sub(r"\D", "", (mobile or "").strip())
-        if len(m) != 10:
+        m = strip_non_digits(mobile)
+        if not is_mobile(m):
             raise ValueError("mobile must be a 10-digit string")
         return m
 
-    def _user_dir(self, mobile: str) -> str:
-        return os.path.join(self.users_root, self._norm_mobile(mobile))
-
-    def _profile_path(self, mobile: str) -> str:
-        return os.path.join(self._user_dir(mobile), "profile.json")
+    # _profile_path/_uploads_dir take an already-normalized mobile (callers normalize once).
+    def _profile_path(self, mob: str) -> str:
+        return _compute_user_path(self.users_root, mob, "profile.json")
 
-    def _uploads_dir(self, mobile: str) -> str:
-        return os.path.join(self._user_dir(mobile), "uploads")
+    def _uploads_dir(self, mob: str) -> str:
+        return _compute_user_path(self.users_root, mob, "uploads")
 
     # ---------- profile ----------
     def load_profile(self, mobile: str) -> Dict[str, str]:
         mob = self._norm_mobile(mobile)
         p = self._profile_path(mob)
-        os.makedirs(os.path.dirname(p), exist_ok=True)
-        if os.path.exists(p):
-            try:
-                with open(p, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            except Exception:
-                data = {}
-        else:
+        try:
+            data = read_json_cached(p)
+        except Exception:
             data = {}
 
-        data.setdefault("mobile", mob)
-        data.setdefault("name", "")
-        data.setdefault("email", "")
-        data.setdefault("state", "")
-        data.setdefault("district", "")
-        data.setdefault("address", "")
+        # Backfill defaults in memory; only touch disk if the file is missing or incomplete.
+        dirty = False
+        for k, v in (("mobile", mob), ("name", ""), ("email", ""),
+                     ("state", ""), ("district", ""), ("address", "")):
+            if k not in data:
+                data[k] = v
+                dirty = True
 
-        # ensure file exists
-        try:
-            with open(p, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception:
-            pass
+        if dirty:
+            try:
+                atomic_write_json(p, data, pretty=True)
+            except Exception:
+                pass
         return data
 
     def save_profile(self, mobile: str, data: Dict[str, str]) -> None:
         mob = self._norm_mobile(mobile)
         p = self._profile_path(mob)
-        os.makedirs(os.path.dirname(p), exist_ok=True)
-        with open(p, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        atomic_write_json(p, data, pretty=True)
 
     # ---------- uploads ----------
     def _detect_media_type(self, ext: str) -> str:
-        ext = (ext or "").lower()
-        if ext in ALLOWED_VIDEO_EXTS:
-            return "video"
-        return "image"
+        t = _EXT_TO_TYPE.get(ext)
+        if t is None:  # mixed case like ".Mp4"
+            t = _EXT_TO_TYPE.get((ext or "").lower(), "image")
+        return t
 
     def _next_digit_for_day(self, mobile: str, date_key: str) -> int:
         """Scan user's uploads dir for existing files for that day and return next digit."""
         mob = self._norm_mobile(mobile)
         udir = self._uploads_dir(mob)
         os.makedirs(udir, exist_ok=True)
-        pattern = os.path.join(udir, f"{mob}_{date_key}_*")
-        digits = []
-        for p in glob.glob(pattern):
-            base = os.path.basename(p)
-            # expected: <mobile>_<YYYYMMDD>_<digit>.<ext>
-            try:
-                part = base.split("_", 2)[2]           # "<digit>.<ext>"
-                d = int(os.path.splitext(part)[0])     # strip extension
-                digits.append(d)
-            except Exception:
-                continue
-        return (max(digits) + 1) if digits else 1
+        prefix = f"{mob}_{date_key}_"
+        max_d = 0
+        with os.scandir(udir) as it:
+            for e in it:
+                n = e.name
+                if not n.startswith(prefix):
+                    continue
+                # expected: <mobile>_<YYYYMMDD>_<digit>.<ext>
+                try:
+                    d = int(os.path.splitext(n[len(prefix):])[0])
+                except ValueError:
+                    continue
+                if d > max_d:
+                    max_d = d
+        return max_d + 1
 
     def add_upload(self, owner_mobile: str, src_fullpath: str, *, date_key: Optional[str] = None) -> UploadRow:
         """Copy file into user's uploads dir with name <mobile>_<YYYYMMDD>_<digit><ext>."""
@@ -120,61 +201,122 @@ class LocalStore:
 
         ext = os.path.splitext(src_fullpath)[1].lower()
         date_key = date_key or _date_key()
-        digit = self._next_digit_for_day(mob, date_key)
+
+        # O(1) digit from the counters sidecar; scan the dir only on a day's first upload.
+        counters_path = os.path.join(udir, ".counters.json")
+        try:
+            counters = read_json_cached(counters_path)
+        except (OSError, ValueError):
+            counters = {}
+        last = counters.get(date_key)
+        digit = last + 1 if isinstance(last, int) else self._next_digit_for_day(mob, date_key)
         dest_name = f"{mob}_{date_key}_{digit}{ext}"
         dst = os.path.join(udir, dest_name)
+        while os.path.exists(dst):  # counters out of sync with the directory
+            digit += 1
+            dest_name = f"{mob}_{date_key}_{digit}{ext}"
+            dst = os.path.join(udir, dest_name)
 
-        shutil.copy2(src_fullpath, dst)
+        # Same filesystem: try a reflink first (metadata only, still an independent copy).
+        try:
+            same_dev = os.stat(src_fullpath).st_dev == os.stat(udir).st_dev
+        except OSError:
+            same_dev = False
+        if not (same_dev and _reflink(src_fullpath, dst)):
+            _fast_copy(src_fullpath, dst)
+        counters[date_key] = digit
+        try:
+            atomic_write_json(counters_path, counters)
+        except Exception:
+            pass
         created = time.time()
         return UploadRow(path=dst, filename=dest_name, media_type=self._detect_media_type(ext), created_at=created)
 
-    def list_uploads_for_mobile(self, owner_mobile: str) -> List[UploadRow]:
-        mob = self._norm_mobile(owner_mobile)
-        udir = self._uploads_dir(mob)
-        out: List[UploadRow] = []
-        if not os.path.isdir(udir):
-            return out
-        for base in sorted(os.listdir(udir)):
-            p = os.path.join(udir, base)
-            if not os.path.isfile(p):
-                continue
-            ext = os.path.splitext(base)[1].lower()
-            try:
-                created = os.path.getmtime(p)
-            except Exception:
-                created = time.time()
-            out.append(UploadRow(path=p, filename=base, media_type=self._detect_media_type(ext), created_at=created))
+    def scan_user_dir(self, mobile: str) -> Dict[str, os.stat_result]:
+        """One scandir pass over the user's uploads dir: {path: stat} for every regular file."""
+        udir = self._uploads_dir(self._norm_mobile(mobile))
+        out: Dict[str, os.stat_result] = {}
+        try:
+            with os.scandir(udir) as it:
+                for e in it:
+                    try:
+                        if e.is_file(follow_symlinks=False):
+                            out[e.path] = e.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+        except FileNotFoundError:
+            pass
         return out
 
-    def user_uploads_dir(self, mobile: str) -> str:
-        return self._uploads_dir(mobile)
-
-    # ---- legacy compatibility (no-op CSV) ----
-    def export_uploads_csv(self) -> str:
-        # Kept only so older UI hooks don't crash if called.
-        return "CSV not used: uploads are per-user in users/<mobile>/uploads/"
-        # local_store.py  (inside list_uploads_for_mobile)
-    
-    
-    def list_uploads_for_mobile(self, owner_mobile: str) -> List[UploadRow]:
+    def list_uploads_for_mobile(self, owner_mobile: str, *,
+                                scan: Optional[Dict[str, os.stat_result]] = None) -> List[UploadRow]:
+        """Uploads sorted by name; pass `scan` (from scan_user_dir) to reuse an existing listing."""
         mob = self._norm_mobile(owner_mobile)
-        udir = self._uploads_dir(mob)
+        if scan is None:
+            scan = self.scan_user_dir(mob)
         out: List[UploadRow] = []
-        if not os.path.isdir(udir):
-            return out
-        prefix = f"{mob}_"
-        for base in sorted(os.listdir(udir)):
-            if not base.startswith(prefix):      # <— enforce "mobile_" prefix
-                continue
-            p = os.path.join(udir, base)
-            if not os.path.isfile(p):
+        prefix = f"{mob}_"  # enforce "mobile_" prefix
+        for path, st in scan.items():
+            name = os.path.basename(path)
+            # skip <upload>.json sidecars (and ones set aside as corrupt)
+            if not name.startswith(prefix) or name.endswith((".json", ".json.bad")):
                 continue
-            ext = os.path.splitext(base)[1].lower()
-            try:
-                created = os.path.getmtime(p)
-            except Exception:
-                created = time.time()
-            out.append(UploadRow(path=p, filename=base,
-                                media_type=self._detect_media_type(ext),
-                                created_at=created))
+            ext = os.path.splitext(name)[1]
+            out.append(UploadRow(path=path, filename=name,
+                                 media_type=self._detect_media_type(ext),
+                                 created_at=st.st_mtime))
+        out.sort(key=lambda r: r.filename)
         return out
+
+    def user_uploads_dir(self, mobile: str) -> str:
+        return self._uploads_dir(self._norm_mobile(mobile))
+
+    # ---------- metadata index ----------
+    def _meta_db(self, mob: str) -> "sqlite3.Connection":
+        conn = self._meta_dbs.get(mob)
+        if conn is None:
+            # in the user dir, not uploads/: creating the db and its -wal/-shm files (and
+            # removing them on close) would bump the uploads mtime the gallery caches key on
+            path = _compute_user_path(self.users_root, mob, _META_DB)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_META_SCHEMA)
+            self._meta_dbs[mob] = conn
+        return conn
+
+    def load_upload_meta(self, mobile: str) -> Dict[str, Tuple[float, int, Dict[str, str]]]:
+        """{filename: (sidecar mtime, sidecar size, meta)} in one SELECT; {} without sqlite3."""
+        if sqlite3 is None:
+            return {}
+        mob = self._norm_mobile(mobile)
+        with self._meta_lock:
+            rows = self._meta_db(mob).execute(
+                "SELECT path, mtime, size, desc, thumb, media_type FROM meta").fetchall()
+        return {name: (mtime, size, {"description": desc or "", "thumb": thumb or "",
+                                     "media_type": media_type or "", "mobile": mob})
+                for name, mtime, size, desc, thumb, media_type in rows}
+
+    def index_upload_meta(self, mobile: str, entries: List[Tuple[str, float, int, Dict]]) -> None:
+        """Upsert (filename, sidecar mtime, sidecar size, meta) rows in one transaction."""
+        if not entries or sqlite3 is None:
+            return
+        mob = self._norm_mobile(mobile)
+        with self._meta_lock:
+            conn = self._meta_db(mob)
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO meta(path, mtime, size, desc, thumb, media_type) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(name, mtime, size, meta.get("description") or "", meta.get("thumb") or "",
+                      meta.get("media_type") or "") for name, mtime, size, meta in entries])
+
+    def close(self) -> None:
+        with self._meta_lock:
+            for conn in self._meta_dbs.values():
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._meta_dbs.clear()
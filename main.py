@@ -13,13 +13,13 @@ os.environ.setdefault("KIVY_VIDEO", "ffpyplayer")
 
 import sys
 import time
-import json
+import hashlib
 import re
 import uuid
-import glob
 import shutil
 import threading
-import csv
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from kivy.lang import Builder
@@ -29,7 +29,9 @@ from kivy.logger import Logger
 from kivy.clock import Clock
 from kivy.utils import platform
 from kivy.cache import Cache
-from kivy.uix.image import AsyncImage
+from kivy.core.text import Label as CoreLabel
+from kivy.metrics import sp
+from kivy.uix.image import AsyncImage, Image
 from kivy.uix.video import Video
 
 from kivymd.app import MDApp
@@ -40,56 +42,196 @@ from kivymd.uix.label import MDLabel
 from kivymd.uix.card import MDCard
 from kivymd.uix.menu import MDDropdownMenu  # <-- proper import here
 
-# ---- camera4kivy import with safe fallback ----
-try:
-    from camera4kivy import Preview          # PyPI name (desktop)
-except Exception:
-    try:
-        from kivy_garden.camera4kivy import Preview  # Garden name (Android/buildozer)
-    except Exception:
-        from kivy.uix.widget import Widget
-        class Preview(Widget):
-            """Fallback so KV loads even if camera4kivy is missing."""
-            pass
+# ---- camera4kivy: imported on first camera use, with safe fallback ----
+from kivy.uix.widget import Widget
+
+
+class Preview(Widget):
+    """Fallback so the camera screen still works if camera4kivy is missing."""
+    pass
+
+
+_preview_cls = None
+
+
+def _import_preview():
+    global _preview_cls
+    if _preview_cls is None:
+        try:
+            from camera4kivy import Preview as cls          # PyPI name (desktop)
+        except Exception:
+            try:
+                from kivy_garden.camera4kivy import Preview as cls  # Garden name (Android/buildozer)
+            except Exception:
+                cls = Preview
+        _preview_cls = cls
+    return _preview_cls
 # -----------------------------------------------
 
-from local_store import LocalStore  # per-user profile + uploads
+from local_store import ALLOWED_IMAGE_EXTS, LocalStore  # per-user profile + uploads
 from auth_store import AuthStore    # local auth (mobile-only)
+from auth_store import atomic_write_bytes, dumps_json, loads_json  # orjson when installed
+from auth_store import strip_non_digits
 
-# optional pickers
-try:
-    from plyer import filechooser
-except Exception:
-    filechooser = None
-try:
-    from plyer import camera as plyer_camera
-except Exception:
-    plyer_camera = None
+# OpenCV fallback (desktop video); imported only when a recording needs it
+_cv2 = None
+
+
+def _import_cv2():
+    """cv2 module, or None if OpenCV isn't installed."""
+    global _cv2
+    if _cv2 is None:
+        try:
+            import cv2
+        except Exception:
+            return None
+        _cv2 = cv2
+    return _cv2
 
-# OpenCV fallback (desktop video)
+# Pillow for gallery thumbnails (falls back to full-size sources without it)
 try:
-    import cv2  # noqa: F401
-    _HAS_CV2 = True
+    from PIL import Image as PILImage
 except Exception:
-    _HAS_CV2 = False
+    PILImage = None
 
+# Validators: compiled once instead of going through re's pattern cache per call
+_PIN_RE = re.compile(r"\d{4,6}")
+_MOBILE_RE = re.compile(r"[0-9]{10}")
+_EMAIL_RE = re.compile(r"[^@]+@[^@]+\.[^@]+")
+# profile form: (text field id, profile key)
+_PROFILE_FIELDS = (("tf_name", "name"), ("tf_mobile", "mobile"), ("tf_email", "email"),
+                   ("tf_state", "state"), ("tf_district", "district"), ("tf_address", "address"))
 
-def _fmt_bytes(n):
+# GStreamer H.264 encoders to try on Linux: V4L2 M2M hardware (Pi-class boards), then x264
+_GST_ENCODERS = ("v4l2h264enc ! h264parse",
+                 "x264enc tune=zerolatency speed-preset=ultrafast")
+
+
+def _has_gstreamer(cv2) -> bool:
     try:
-        for u in ["B", "KB", "MB", "GB", "TB"]:
-            if n < 1024.0:
-                return f"{n:.1f} {u}"
-            n /= 1024.0
+        return any(line.strip().startswith("GStreamer:") and "YES" in line
+                   for line in cv2.getBuildInformation().splitlines())
     except Exception:
-        pass
-    return "?"
+        return False
+
+
+def _open_video_writer(cv2, path, fps, size):
+    """First VideoWriter that opens: the platform's H.264 encoder, else software mp4v."""
+    # (label, filename/pipeline, apiPreference or None, fourcc)
+    candidates = []
+    if platform == "win" and hasattr(cv2, "CAP_MSMF"):
+        candidates.append(("H264/MSMF", path, cv2.CAP_MSMF, "H264"))            # Media Foundation
+    elif platform == "macosx" and hasattr(cv2, "CAP_AVFOUNDATION"):
+        candidates.append(("avc1/AVFoundation", path, cv2.CAP_AVFOUNDATION, "avc1"))  # VideoToolbox
+    elif platform == "linux" and _has_gstreamer(cv2):
+        # escaped inside the quoted location, so a '"', backslash or '!' in the path can't break parsing
+        location = path.replace("\\", "\\\\").replace('"', '\\"')
+        for enc in _GST_ENCODERS:
+            pipeline = (f"appsrc ! videoconvert ! {enc} ! mp4mux ! "
+                        f"filesink location=\"{location}\"")
+            candidates.append((enc.split()[0], pipeline, cv2.CAP_GSTREAMER, None))
+    candidates.append(("mp4v", path, None, "mp4v"))
+    for label, target, api, cc in candidates:
+        fourcc = cv2.VideoWriter_fourcc(*cc) if cc else 0
+        try:
+            if api is None:
+                writer = cv2.VideoWriter(target, fourcc, fps, size)
+            else:
+                writer = cv2.VideoWriter(target, api, fourcc, fps, size, True)
+        except cv2.error as e:
+            Logger.info(f"VideoWriter {label} unavailable: {e}")
+            continue
+        if writer.isOpened():
+            Logger.info(f"VideoWriter: {label}")
+            return writer
+        writer.release()
+    return None
+
+
+_PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+THUMB_SIZE = (256, 256)
+
+
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB")
+_TIME_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def _fmt_bytes(n):
+    n = int(n)
+    if n < 0:
+        return "?"
+    # unit index straight from the bit length: 2**10 per step, clamped to B..TB
+    i = min(max((n.bit_length() - 1) // 10, 0), 4)
+    return f"{n / (1 << (10 * i)):.1f} {_BYTE_UNITS[i]}"
 
 
 def _fmt_time(ts):
+    return time.strftime(_TIME_FMT, time.localtime(ts))
+
+
+def _thumb_path(filepath: str, thumb: str = "") -> str:
+    """uploads/<name> -> uploads/thumbs/<name>.jpg, or uploads/thumbs/<thumb> for a sidecar "thumb"."""
+    d, name = os.path.split(filepath)
+    # bare file names only, as _generate_thumb writes: nothing that can leave uploads/thumbs
+    if not thumb or os.path.basename(thumb) != thumb or thumb in (".", ".."):
+        thumb = name + ".jpg"
+    return os.path.join(d, "thumbs", thumb)
+
+
+def _make_thumbnail(src: str, dst: str) -> bool:
+    """Write a THUMB_SIZE JPEG of src to dst; False if Pillow is missing or src can't be decoded."""
+    if PILImage is None:
+        return False
+    tmp = dst + ".tmp"
     try:
-        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
-    except Exception:
-        return "?"
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        with PILImage.open(src) as img:
+            img.thumbnail(THUMB_SIZE, PILImage.LANCZOS)
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            img.save(tmp, "JPEG", quality=82, optimize=True)
+        os.replace(tmp, dst)
+        return True
+    except Exception as e:
+        Logger.warning(f"Thumbnail failed for {src}: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+
+
+def _json_load(path: str):
+    with open(path, "rb") as f:
+        return loads_json(f.read())
+
+
+def _json_dump(path: str, obj, *, pretty: bool = True) -> None:
+    """Encode once, then tmpfile + fsync + os.replace so a crash never leaves a truncated file."""
+    atomic_write_bytes(path, dumps_json(obj, pretty=pretty))
+
+
+def _load_sidecars(paths) -> dict:
+    """Worker: {path: sidecar meta} for a batch of upload paths ({} when missing/unreadable)."""
+    out = {}
+    for path in paths:
+        meta = {}
+        sidecar = path + ".json"
+        try:
+            meta = _json_load(sidecar)
+        except FileNotFoundError:
+            pass
+        except ValueError:  # truncated/corrupt: set it aside so it isn't re-parsed every load
+            Logger.warning(f"Corrupt sidecar moved aside: {sidecar}")
+            try:
+                os.replace(sidecar, sidecar + ".bad")
+            except OSError:
+                pass
+        except Exception:
+            pass
+        out[path] = meta
+    return out
 
 
 # ---------- crash logger ----------
@@ -110,6 +252,14 @@ def install_crashlog(path: str):
 # Cache config (raise limits slightly for smoother gallery previews)
 Cache.register('asyncimage', limit=64)
 Cache.register('preview_image', limit=4)
+# Kivy's own image/texture caches are unbounded by default and keep GPU textures alive
+for _cat in ("kv.texture", "kv.image"):
+    if _cat in Cache._categories:
+        Cache._categories[_cat]["limit"] = 64
+del _cat
+
+# Max gallery tiles holding a texture at once; off-screen tiles beyond this are released
+TILE_TEXTURE_LIMIT = 48
 
 
 class PhotoApp(MDApp):
@@ -124,13 +274,42 @@ class PhotoApp(MDApp):
         self._gallery_loaded = False
         self._current_chunk_index = 0
         self._chunk_size = 8
+        # Sidecar metadata, prefetched off the UI thread: path -> meta
+        self._meta_pool: Optional[ThreadPoolExecutor] = None
+        # Login/register (PBKDF2) off the UI thread, one at a time
+        self._auth_pool: Optional[ThreadPoolExecutor] = None
+        self._auth_busy = False
+        # Small background writes (login history), one at a time in submission order
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        # Thumbnails on one worker so no two jobs write the same thumb; paths queued or in progress
+        self._thumb_pool: Optional[ThreadPoolExecutor] = None
+        self._thumb_queued: set = set()
+        self._thumb_lock = threading.Lock()
+        self._meta_cache: dict = {}
+        self._meta_gen = 0
+        self._chunk_waiting = False
+        self._chunk_trigger = Clock.create_trigger(self._load_next_chunk, 0.05)
+        # path -> os.stat_result from the last uploads-dir scan
+        self._stat_cache: dict = {}
+        # Gallery image widgets (path -> widget) and the LRU of those currently holding a texture
+        self._tile_images: dict = {}
+        self._tile_lru: OrderedDict = OrderedDict()
+        self._tile_lru_trigger = Clock.create_trigger(self._update_tile_textures, 0.1)
+        self._gallery_scroll_bound = False
+        self._gallery_mobile = ""
+        self._refresh_uploads_trigger = Clock.create_trigger(self.refresh_uploads_for_active_user, 0.1)
+        # mobile -> uploads dir path; mobile -> (dir st_mtime_ns, scan, rows) of the last listing,
+        # which is also how rebuilds are skipped while the uploads dir is unchanged
+        self._uploads_dir_cache: dict = {}
+        self._uploads_list_cache: dict = {}
 
         # Shutter/recording state
-        self._press_evt = None
         self._is_pressing = False
         self._is_recording = False
         self._record_path: Optional[str] = None
         self.LONG_PRESS_MS = 300
+        self._press_trigger = Clock.create_trigger(lambda dt: self._maybe_start_recording(),
+                                                   self.LONG_PRESS_MS / 1000.0)
 
         # Stopwatch
         self._rec_start_ts = 0.0
@@ -138,15 +317,36 @@ class PhotoApp(MDApp):
 
         # Preview state: "image" or "video"
         self._preview_mode = "image"
+        self._preview_img = None  # strong ref so the kv image survives a video preview
+        self._preview_video_size = 0
 
         # OpenCV thread state
         self._cv_thread = None
-        self._cv_stop_flag = False
+        self._cv2_warm_scheduled = False
+        self._cv_stop_flag: Optional[threading.Event] = None  # fresh per recording
+        self._rec_stop_deadline = 0.0
 
         # Camera attrs
         self._cam_widget: Optional[Preview] = None
         self._cam_connected = False
         self._last_capture_path: Optional[str] = None
+        # Most recent temp captures/recordings; the oldest is deleted as a new one arrives
+        self._temp_ring: deque = deque(maxlen=3)
+        # Shutter frame kept in memory (CoreImage) until Save writes it to _last_capture_path
+        self._last_capture_core = None
+
+        # "▶" glyph rasterized once in build() and shared by every video tile
+        self._play_icon_tex = None
+
+        # Profile form refresh, deferred to just before the next frame
+        self._profile_update_trigger = Clock.create_trigger(self._do_bind_profile_to_ui, -1)
+        self._profile_save_trigger = Clock.create_trigger(self._flush_profile_save, 0.3)
+        self._pending_profile_save = None  # (mobile, profile) snapshot from the last Save
+
+        # Window-title notifications (rate-limited in _notify)
+        self._last_title_ts = 0.0
+        self._pending_title = ""
+        self._title_trigger = Clock.create_trigger(self._apply_title, 0.5)
 
         # Theme dropdown menu handle
         self._theme_menu: Optional[MDDropdownMenu] = None
@@ -167,16 +367,14 @@ class PhotoApp(MDApp):
 
     def _load_ui_prefs(self):
         try:
-            with open(self._prefs_path(), "r", encoding="utf-8") as f:
-                return json.load(f) or {}
+            return _json_load(self._prefs_path())
         except Exception:
             return {}
 
     def _save_ui_prefs(self, prefs: dict):
         try:
             os.makedirs(self.user_data_dir, exist_ok=True)
-            with open(self._prefs_path(), "w", encoding="utf-8") as f:
-                json.dump(prefs, f, ensure_ascii=False, indent=2)
+            _json_dump(self._prefs_path(), prefs)
         except Exception:
             pass
 
@@ -211,30 +409,63 @@ class PhotoApp(MDApp):
     # main.py (add this method in PhotoApp)
     def refresh_uploads_for_active_user(self, *_):
         mobile = (self.profile_data.get("mobile") or "").strip()
-        uploads = self.store.list_uploads_for_mobile(mobile) if mobile else []
         grid = getattr(self.root, "ids", {}).get("uploads_grid")
         if not grid:
             return
+        mtime = self._uploads_mtime(mobile)
+        hit = self._uploads_list_cache.get(mobile)
+        if (self._gallery_loaded and mobile == self._gallery_mobile
+                and mtime is not None and hit is not None and hit[0] == mtime):
+            return  # nothing added/removed since the last build
+        self._gallery_mobile = mobile
+        self._stat_cache, uploads = self._list_uploads(mobile, mtime)
+        self._release_tile_textures()
         grid.clear_widgets()
         self._current_chunk_index = 0
-        self._all_uploads = [row for row in uploads if os.path.exists(row.path)]
+        self._all_uploads = uploads
         self._gallery_loaded = False
-        self._load_next_chunk()
+        self._generate_thumbs_async(mobile, [r.path for r in self._all_uploads if r.media_type == "image"])
+        self._prefetch_gallery_meta()
+
+    def _user_uploads_dir(self, mobile: str) -> str:
+        d = self._uploads_dir_cache.get(mobile)
+        if d is None:
+            d = self._uploads_dir_cache[mobile] = self.store.user_uploads_dir(mobile)
+        return d
+
+    def _uploads_mtime(self, mobile: str):
+        if not mobile:
+            return None
+        try:
+            return os.stat(self._user_uploads_dir(mobile)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _list_uploads(self, mobile: str, mtime):
+        """(stat scan, upload rows) for mobile, re-listed only when the uploads dir mtime
+        (the caller's _uploads_mtime, stat'ed once per refresh) moves."""
+        if not mobile:
+            return {}, []
+        hit = self._uploads_list_cache.get(mobile)
+        if hit is not None and mtime is not None and hit[0] == mtime:
+            return hit[1], hit[2]
+        scan = self.store.scan_user_dir(mobile)
+        uploads = self.store.list_uploads_for_mobile(mobile, scan=scan)
+        self._uploads_list_cache[mobile] = (mtime, scan, uploads)
+        return scan, uploads
 
     def open_upload_detail(self, filepath: str):
         """Open a modal dialog with big preview + description + file info."""
         try:
-            # read meta sidecar (added earlier when saving)
-            meta = {}
-            sidecar = filepath + ".json"
-            if os.path.exists(sidecar):
-                with open(sidecar, "r", encoding="utf-8") as f:
-                    meta = json.load(f) or {}
+            # meta sidecar (added earlier when saving); usually already prefetched
+            meta = self._meta_cache.get(filepath)
+            if meta is None:
+                meta = _load_sidecars([filepath])[filepath]
 
             desc = (meta.get("description") or "").strip()
             mobile = (meta.get("mobile") or "").strip()
 
-            st = os.stat(filepath)
+            st = self._stat_cache.get(filepath) or os.stat(filepath)
             fname = os.path.basename(filepath)
             size_s = _fmt_bytes(st.st_size)
             mtime_s = _fmt_time(st.st_mtime)
@@ -276,13 +507,13 @@ class PhotoApp(MDApp):
         Returns (ok, 'mobile', digits or error_msg)
         """
         s = self._as_text(s)
-        digits = re.sub(r"\D", "", s)
+        digits = strip_non_digits(s)
         if len(digits) != 10:
             return False, "mobile", "Mobile must be 10 digits"
         return True, "mobile", digits
 
     def _is_valid_pin(self, pin: str) -> bool:
-        return bool(re.fullmatch(r"\d{4,6}", self._as_text(pin)))
+        return bool(_PIN_RE.fullmatch(self._as_text(pin)))
 
     # ---------- KV loading ----------
     def _load_kv_files(self):
@@ -355,9 +586,22 @@ class PhotoApp(MDApp):
 
         self.store = LocalStore(self.user_data_dir)
         self.auth = AuthStore(self.user_data_dir)
+        self._meta_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="meta")
+        self._auth_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="auth")
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="io")
+        self._thumb_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumb")
+        threading.Thread(target=self._cleanup_temp_files,
+                         args=(os.path.join(self.user_data_dir, "temp_captures"),), daemon=True).start()
 
         root = self._load_kv_files()
 
+        try:
+            core = CoreLabel(text="▶", font_size=sp(48))
+            core.refresh()
+            self._play_icon_tex = core.texture
+        except Exception as e:
+            Logger.warning(f"Play icon render failed: {e}")
+
         try:
             u = self.auth.current_user()
             sm = getattr(root, "ids", {}).get("screen_manager")
@@ -377,10 +621,10 @@ class PhotoApp(MDApp):
             except Exception:
                 pass
 
-        Clock.schedule_once(lambda *_: self._delayed_gallery_init(), 0.8)
+        Clock.schedule_once(self._delayed_gallery_init, 0.8)
         return root
 
-    def _delayed_gallery_init(self):
+    def _delayed_gallery_init(self, *_):
         if not self._gallery_loaded:
             self._bootstrap_gallery_for_mobile()
 
@@ -416,26 +660,34 @@ class PhotoApp(MDApp):
                 self._is_pressing = False
                 self._update_video_button_text()
             elif name == "uploads":
-                Clock.schedule_once(self.refresh_uploads_for_active_user, 0.05)
+                self._refresh_uploads_trigger()
 
         self.close_nav_drawer()
 
     # ---------- Auth (MOBILE ONLY) ----------
     def auth_register(self, identifier, pin, pin2="", name=""):
         # identifier is expected to be the mobile field; keeping name for KV compatibility
-        ok, _id_type, mobile_or_err = self._is_valid_identifier(identifier)
+        # coerce each widget/value to text once
+        id_s = self._as_text(identifier)
+        pin_s = self._as_text(pin)
+        pin2_s = self._as_text(pin2) if pin2 else ""
+        ok, _id_type, mobile_or_err = self._is_valid_identifier(id_s)
         if not ok:
             self._notify(mobile_or_err); return
-        if not self._is_valid_pin(pin):
+        if not self._is_valid_pin(pin_s):
             self._notify("PIN must be 4-6 digits"); return
-        if self._as_text(pin2) and self._as_text(pin) != self._as_text(pin2):
+        if pin2_s and pin_s != pin2_s:
             self._notify("PINs do not match"); return
 
+        # New auth_store API: register(mobile, pin); PIN hashing runs on the auth worker
+        name_text = self._as_text(name)
+        self._submit_auth("register", "btn_register", self.auth.register, (mobile_or_err, pin_s),
+                          lambda fut: self._finish_register(fut, mobile_or_err, name_text))
+
+    def _finish_register(self, fut, mobile_or_err, name_text):
         try:
-            # New auth_store API: register(mobile, pin)
-            user = self.auth.register(mobile_or_err, self._as_text(pin))
+            user = fut.result()
             self._set_active_user(user)
-            name_text = self._as_text(name)
             if name_text:
                 self.profile_data["name"] = name_text
             self.profile_data["mobile"] = mobile_or_err
@@ -446,8 +698,7 @@ class PhotoApp(MDApp):
                 legacy = os.path.join(self.user_data_dir, 'profile.json')
                 if os.path.exists(legacy) and all(not (self.profile_data.get(k) or "").strip()
                                                   for k in ('name', 'email', 'mobile')):
-                    with open(legacy, 'r', encoding='utf-8') as f:
-                        legacy_data = json.load(f)
+                    legacy_data = _json_load(legacy)
                     for k in ('name', 'mobile', 'email', 'state', 'district', 'address'):
                         v = legacy_data.get(k)
                         if isinstance(v, str) and v.strip():
@@ -463,15 +714,21 @@ class PhotoApp(MDApp):
             self._notify(str(e))
 
     def auth_login(self, identifier, pin):
-        ok, _id_type, mobile_or_err = self._is_valid_identifier(identifier)
+        id_s = self._as_text(identifier)
+        pin_s = self._as_text(pin)
+        ok, _id_type, mobile_or_err = self._is_valid_identifier(id_s)
         if not ok:
             self._notify(mobile_or_err); return
-        if not self._is_valid_pin(pin):
+        if not self._is_valid_pin(pin_s):
             self._notify("PIN must be 4-6 digits"); return
 
+        # New auth_store API: login(mobile, pin); PIN hashing runs on the auth worker
+        self._submit_auth("login", "btn_login", self.auth.login, (mobile_or_err, pin_s),
+                          lambda fut: self._finish_login(fut, mobile_or_err))
+
+    def _finish_login(self, fut, mobile_or_err):
         try:
-            # New auth_store API: login(mobile, pin)
-            user = self.auth.login(mobile_or_err, self._as_text(pin))
+            user = fut.result()
             self._set_active_user(user)
             self._write_login_history(user, mobile_or_err)
             self._notify(f"Welcome {user.get('mobile')}")
@@ -487,7 +744,30 @@ class PhotoApp(MDApp):
             else:
                 self._notify(str(e))
 
+    def _submit_auth(self, screen, btn_id, fn, args, finish):
+        """Run fn(*args) on the auth worker with the screen's button disabled; finish(fut) on the UI thread."""
+        if self._auth_busy:
+            return
+        btn = None
+        try:
+            btn = self.root.ids.screen_manager.get_screen(screen).ids.get(btn_id)
+        except Exception:
+            pass
+        self._auth_busy = True
+        if btn is not None:
+            btn.disabled = True
+
+        def _done(fut):
+            self._auth_busy = False
+            if btn is not None:
+                btn.disabled = False
+            finish(fut)
+
+        fut = self._auth_pool.submit(fn, *args)
+        fut.add_done_callback(lambda f: Clock.schedule_once(lambda dt: _done(f)))
+
     def auth_logout(self):
+        self._flush_pending_profile_save()
         try:
             self.auth.logout()
             self.profile_data = {}
@@ -499,8 +779,7 @@ class PhotoApp(MDApp):
     # ---------- Shutter (tap/hold) ----------
     def on_shutter_press(self):
         self._is_pressing = True
-        delay = self.LONG_PRESS_MS / 1000.0
-        self._press_evt = Clock.schedule_once(lambda *_: self._maybe_start_recording(), delay)
+        self._press_trigger()
 
     def on_shutter_release(self):
         was_recording = self._is_recording
@@ -511,15 +790,9 @@ class PhotoApp(MDApp):
         self.capture_frame()
 
     def _cancel_press_timer(self):
-        if self._press_evt is not None:
-            try:
-                self._press_evt.cancel()
-            except Exception:
-                pass
-            self._press_evt = None
+        self._press_trigger.cancel()
 
     def _maybe_start_recording(self):
-        self._press_evt = None
         if not self._is_pressing:
             return
         self._start_video_recording()
@@ -541,6 +814,10 @@ class PhotoApp(MDApp):
     def pick_image(self):
         def _do_pick(dt):
             path = None
+            try:
+                from plyer import filechooser  # optional picker, imported on first use
+            except Exception:
+                filechooser = None
             try:
                 if filechooser:
                     paths = filechooser.open_file(
@@ -559,23 +836,23 @@ class PhotoApp(MDApp):
 
     # ---------- Save to gallery (per-user) ----------
     def save_current_to_gallery(self):
-        if not (self._last_capture_path and os.path.exists(self._last_capture_path)):
+        if not (self._last_capture_path and (self._last_capture_core is not None
+                                             or os.path.exists(self._last_capture_path))):
             self._notify("No media to save"); return
         mobile = (self.profile_data.get("mobile") or "").strip()
-        if not re.fullmatch(r"[0-9]{10}", mobile):
+        if not _MOBILE_RE.fullmatch(mobile):
             self._notify("Your profile mobile is missing/invalid"); return
 
         ids = getattr(self.root, "ids", {})
-        desc = ""
-        try:
-            desc = (ids.get("desc_input").text or "").strip()
-        except Exception:
-            pass
+        desc = self._as_text(ids.get("desc_input"))
 
         def _do_save(dt):
+            if not self._materialize_capture():
+                return
             try:
                 # LocalStore handles naming <mobile>_<YYYYMMDD>_<digit>.<ext>
                 row = self.store.add_upload(mobile, self._last_capture_path)
+                self._uploads_list_cache.pop(mobile, None)
 
                 # write sidecar metadata next to the saved file
                 sidecar = row.path + ".json"
@@ -587,10 +864,12 @@ class PhotoApp(MDApp):
                     "media_type": row.media_type,
                 }
                 try:
-                    with open(sidecar, "w", encoding="utf-8") as f:
-                        json.dump(meta, f, ensure_ascii=False, indent=2)
+                    _json_dump(sidecar, meta, pretty=False)
                 except Exception as e:
                     self._notify(f"Meta save warn: {e}")
+                self._meta_cache[row.path] = meta
+                self._index_sidecar(mobile, row.path, meta)
+                self._generate_thumbs_async(mobile, [row.path])
 
                 # optional: clear the text field for next time
                 try:
@@ -606,22 +885,138 @@ class PhotoApp(MDApp):
                 self._notify(f"Save failed: {e}")
         Clock.schedule_once(_do_save, 0.1)
 
+    # ---------- Thumbnails ----------
+    def _generate_thumbs(self, mobile, paths):
+        """Thumb worker: build missing thumbnails and record them in each sidecar as "thumb"."""
+        for path in paths:
+            try:
+                self._generate_thumb(mobile, path)
+            finally:
+                with self._thumb_lock:
+                    self._thumb_queued.discard(path)
+
+    def _generate_thumb(self, mobile, path):
+        if os.path.splitext(path)[1].lower() not in ALLOWED_IMAGE_EXTS:
+            return
+        # sidecars store the name relative to uploads/thumbs, so a moved data dir keeps working
+        name = os.path.basename(path) + ".jpg"
+        thumb = _thumb_path(path)
+        sidecar = path + ".json"
+        try:
+            meta = self._meta_cache.get(path)
+            if meta is None:
+                meta = _json_load(sidecar) if os.path.exists(sidecar) else {}
+        except Exception:
+            meta = {}
+        # skip on the sidecar field, not the file: a thumb written just before a crash
+        # still needs its sidecar entry
+        if meta.get("thumb") == name and os.path.exists(thumb):
+            return
+        if not os.path.exists(thumb) and not _make_thumbnail(path, thumb):
+            return
+        try:
+            meta = {}
+            if os.path.exists(sidecar):
+                meta = _json_load(sidecar)
+            if meta.get("thumb") != name:
+                meta["thumb"] = name
+                _json_dump(sidecar, meta, pretty=False)
+                self._index_sidecar(mobile, path, meta)
+            self._meta_cache[path] = meta
+        except Exception as e:
+            Logger.warning(f"Thumb meta update failed for {path}: {e}")
+
+    def _generate_thumbs_async(self, mobile, paths):
+        if not paths or PILImage is None or self._thumb_pool is None:
+            return
+        # a save queues its row, then the uploads refresh queues every image: skip duplicates
+        with self._thumb_lock:
+            paths = [p for p in paths if p not in self._thumb_queued]
+            self._thumb_queued.update(paths)
+        if paths:
+            self._thumb_pool.submit(self._generate_thumbs, mobile, paths)
+
+    # ---------- Sidecar index (.meta.sqlite) ----------
+    def _index_sidecar(self, mobile, path, meta):
+        """Mirror a just-written sidecar into the SQLite index, keyed by the sidecar's mtime/size."""
+        try:
+            st = os.stat(path + ".json")
+            self.store.index_upload_meta(mobile, [(os.path.basename(path), st.st_mtime, st.st_size, meta)])
+        except Exception as e:
+            Logger.warning(f"Meta index update failed for {path}: {e}")
+
+    def _seed_meta_from_index(self):
+        """Fill _meta_cache from one SELECT; rows count only if the sidecar on disk is unchanged."""
+        mobile = self._gallery_mobile
+        missing = [r for r in self._all_uploads if r.path not in self._meta_cache]
+        if not (mobile and missing):
+            return
+        try:
+            index = self.store.load_upload_meta(mobile)
+        except Exception as e:
+            Logger.warning(f"Meta index read failed: {e}")
+            return
+        for r in missing:
+            hit = index.get(r.filename)
+            st = self._stat_cache.get(r.path + ".json")
+            if hit is not None and st is not None and hit[0] == st.st_mtime and hit[1] == st.st_size:
+                self._meta_cache[r.path] = hit[2]
+
     # ---------- Gallery (mobile-scoped) ----------
     def _bootstrap_gallery_for_mobile(self):
         if self._gallery_loaded:
             return
         mobile = (self.profile_data.get("mobile") or "").strip()
-        uploads = self.store.list_uploads_for_mobile(mobile) if mobile else []
         grid = getattr(self.root, "ids", {}).get("uploads_grid")
         if not grid:
             self._gallery_loaded = True
             return
+        self._gallery_mobile = mobile
+        self._stat_cache, uploads = self._list_uploads(mobile, self._uploads_mtime(mobile))
+        self._release_tile_textures()
         grid.clear_widgets()
         self._current_chunk_index = 0
-        self._all_uploads = [row for row in uploads if os.path.exists(row.path)]
+        self._all_uploads = uploads
+        self._generate_thumbs_async(mobile, [r.path for r in self._all_uploads if r.media_type == "image"])
+        self._prefetch_gallery_meta()
+
+    def _prefetch_gallery_meta(self):
+        """Read missing sidecars on the pool, one batch per chunk; tiles render as batches land."""
+        self._meta_gen += 1
+        gen = self._meta_gen
+        self._chunk_waiting = False
+        self._chunk_trigger.cancel()
+        self._seed_meta_from_index()
+        paths = [r.path for r in self._all_uploads if r.path not in self._meta_cache]
+        n = self._chunk_size
+        for i in range(0, len(paths), n):
+            fut = self._meta_pool.submit(_load_sidecars, paths[i:i + n])
+            fut.add_done_callback(
+                lambda f, gen=gen: Clock.schedule_once(lambda dt: self._on_meta_loaded(gen, f)))
         self._load_next_chunk()
 
-    def _load_next_chunk(self):
+    def _on_meta_loaded(self, gen, fut):
+        if gen != self._meta_gen:  # a newer refresh superseded this batch
+            return
+        try:
+            loaded = fut.result()
+        except Exception as e:
+            Logger.warning(f"Sidecar prefetch failed: {e}")
+            return
+        self._meta_cache.update(loaded)
+        # index what was read so the next gallery load is served by the SQLite SELECT
+        entries = []
+        for path, meta in loaded.items():
+            st = self._stat_cache.get(path + ".json")
+            if meta and st is not None:
+                entries.append((os.path.basename(path), st.st_mtime, st.st_size, meta))
+        if entries and self._gallery_mobile:
+            self._meta_pool.submit(self.store.index_upload_meta, self._gallery_mobile, entries)
+        if self._chunk_waiting:
+            self._chunk_waiting = False
+            self._load_next_chunk()
+
+    def _load_next_chunk(self, *_):
         if not hasattr(self, '_all_uploads'):
             return
         grid = getattr(self.root, "ids", {}).get("uploads_grid")
@@ -629,36 +1024,40 @@ class PhotoApp(MDApp):
             return
         start_idx = self._current_chunk_index
         end_idx = min(start_idx + self._chunk_size, len(self._all_uploads))
-        for i in range(start_idx, end_idx):
-            self._add_upload_tile(self._all_uploads[i].path)
+        cache = self._meta_cache
+        if any(self._all_uploads[i].path not in cache for i in range(start_idx, end_idx)):
+            self._chunk_waiting = True  # resumed by _on_meta_loaded
+            return
+        # build the whole chunk first, then attach it in one tight loop; Kivy's
+        # _trigger_layout coalesces the adds into a single layout pass next frame
+        cards = [self._build_upload_tile(self._all_uploads[i].path) for i in range(start_idx, end_idx)]
+        for card in cards:
+            grid.add_widget(card)
+        self._bind_gallery_scroll(grid)
+        self._tile_lru_trigger()
         self._current_chunk_index = end_idx
         if end_idx < len(self._all_uploads):
-            Clock.schedule_once(lambda dt: self._load_next_chunk(), 0.05)
+            self._chunk_trigger()
         else:
             self._gallery_loaded = True
 
     def _add_upload_tile(self, filepath):
-        from kivymd.uix.card import MDCard
-        from kivymd.uix.label import MDLabel
-        from kivymd.uix.boxlayout import MDBoxLayout
-
         grid = getattr(self.root, "ids", {}).get("uploads_grid")
         if not grid:
             return
+        grid.add_widget(self._build_upload_tile(filepath))
+        self._bind_gallery_scroll(grid)
+        self._tile_lru_trigger()
 
+    def _build_upload_tile(self, filepath):
+        """Card widget for one upload (not yet attached to the grid)."""
         ext = os.path.splitext(filepath)[1].lower()
         is_video = ext in (".mp4", ".mov", ".mkv", ".3gp", ".webm", ".avi")
 
-        # read sidecar description if available
-        desc_text = ""
-        try:
-            sidecar = filepath + ".json"
-            if os.path.exists(sidecar):
-                with open(sidecar, "r", encoding="utf-8") as f:
-                    meta = json.load(f) or {}
-                desc_text = (meta.get("description") or "").strip()
-        except Exception:
-            pass
+        # sidecar description/thumbnail, prefetched by _prefetch_gallery_meta (no I/O here)
+        meta = self._meta_cache.get(filepath) or {}
+        desc_text = (meta.get("description") or "").strip()
+        thumb = meta.get("thumb") or ""
 
         card = MDCard(orientation="vertical", radius=[8], elevation=1,
                       size_hint_y=None, height="180dp", padding="4dp")
@@ -667,25 +1066,79 @@ class PhotoApp(MDApp):
         card.add_widget(inner)
 
         if is_video:
-            label = MDLabel(text=f"▶ {os.path.basename(filepath)}",
-                            halign="center", theme_text_color="Secondary")
+            if self._play_icon_tex is not None:
+                inner.add_widget(Image(texture=self._play_icon_tex, allow_stretch=False))
+            label = MDLabel(text=os.path.basename(filepath), font_style="Caption",
+                            halign="center", theme_text_color="Secondary",
+                            size_hint_y=None, height="20dp")
             inner.add_widget(label)
         else:
-            img = AsyncImage(source=filepath, allow_stretch=True, keep_ratio=True,
-                             mipmap=True, nocache=False, anim_delay=0.1)
+            # 256px thumb instead of the full-res original; no mipmaps for a 180dp card.
+            # nocache: textures are owned by the tile and released by _update_tile_textures
+            if thumb:
+                # small local JPEG: load directly, skipping the AsyncImage Loader queue
+                img = Image(source=_thumb_path(filepath, thumb), allow_stretch=True, keep_ratio=True,
+                            mipmap=False, nocache=True)
+            else:
+                # no thumb yet: full-size original, decoded off the UI thread
+                img = AsyncImage(source=filepath, allow_stretch=True, keep_ratio=True,
+                                 mipmap=False, nocache=True, anim_delay=0.1)
             inner.add_widget(img)
+            self._tile_images[filepath] = (img, img.source)
+            self._tile_lru[filepath] = img
 
         if desc_text:
             subtitle = MDLabel(text=desc_text, halign="center",
                                theme_text_color="Secondary")
             inner.add_widget(subtitle)
 
-        grid.add_widget(card)
+        return card
+
+    def _bind_gallery_scroll(self, grid):
+        if self._gallery_scroll_bound or grid.parent is None:
+            return
+        grid.parent.bind(scroll_y=lambda *_: self._tile_lru_trigger())
+        self._gallery_scroll_bound = True
+
+    def _update_tile_textures(self, *_):
+        """Keep at most TILE_TEXTURE_LIMIT tile textures: reload visible tiles, drop the stalest hidden ones."""
+        grid = getattr(self.root, "ids", {}).get("uploads_grid")
+        sv = grid.parent if grid else None
+        if sv is None or not self._tile_images:
+            return
+        # viewport in window coords, padded by one screen so near-visible tiles stay loaded
+        _, bottom = sv.to_window(sv.x, sv.y)
+        lo, hi = bottom - sv.height, bottom + 2 * sv.height
+        visible = set()
+        for path, (img, src) in self._tile_images.items():
+            _, y = img.to_window(img.x, img.y)
+            if y + img.height >= lo and y <= hi:
+                visible.add(path)
+                if path in self._tile_lru:
+                    self._tile_lru.move_to_end(path)
+                else:
+                    img.source = src  # assigning the source reloads it
+                    self._tile_lru[path] = img
+        excess = len(self._tile_lru) - TILE_TEXTURE_LIMIT
+        for path in list(self._tile_lru):
+            if excess <= 0:
+                break
+            if path in visible:
+                continue
+            # the core image (CoreImage/ProxyImage) holds the texture; an empty source clears it
+            self._tile_lru.pop(path).source = ""
+            excess -= 1
+
+    def _release_tile_textures(self):
+        for img, _ in self._tile_images.values():
+            img.source = ""
+        self._tile_images.clear()
+        self._tile_lru.clear()
 
     def open_uploads_folder(self):
         # open this user's uploads folder
         mobile = (self.profile_data.get("mobile") or "").strip()
-        path = self.store.user_uploads_dir(mobile) if mobile else self.user_data_dir
+        path = self._user_uploads_dir(mobile) if mobile else self.user_data_dir
         try:
             if os.name == "nt":
                 os.startfile(path)  # type: ignore
@@ -699,7 +1152,7 @@ class PhotoApp(MDApp):
     def show_csv_path(self):
         # kept for compatibility – now shows the uploads directory instead of a CSV
         mobile = (self.profile_data.get("mobile") or "").strip()
-        self._notify(f"Uploads dir: {self.store.user_uploads_dir(mobile) if mobile else '(no user)'}")
+        self._notify(f"Uploads dir: {self._user_uploads_dir(mobile) if mobile else '(no user)'}")
 
     # ---------- Webcam preview (camera4kivy) ----------
     def _ensure_cam_widget(self):
@@ -709,7 +1162,7 @@ class PhotoApp(MDApp):
         if self._cam_widget is not None:
             return self._cam_widget
         try:
-            w = Preview()
+            w = _import_preview()()
             holder.clear_widgets()
             holder.add_widget(w)
             self._cam_widget = w
@@ -728,6 +1181,7 @@ class PhotoApp(MDApp):
         prev = self._ensure_cam_widget()
         if prev is None:
             self._notify("Camera not available"); return
+        self._warm_cv2_if_needed(prev)
         if not hasattr(prev, "connect_camera"):
             self._notify("camera4kivy not available"); return
         if self._cam_connected:
@@ -746,6 +1200,14 @@ class PhotoApp(MDApp):
             self._notify(f"Start camera failed: {e}")
             self._cam_connected = False
 
+    def _warm_cv2_if_needed(self, prev):
+        """Widgets without start_recording record through OpenCV: load cv2 in the background
+        once the first frames are up, so the first recording doesn't pay for it."""
+        if self._cv2_warm_scheduled or hasattr(prev, "start_recording"):
+            return
+        self._cv2_warm_scheduled = True
+        Clock.schedule_once(lambda dt: threading.Thread(target=_import_cv2, daemon=True).start(), 2.0)
+
     def stop_camera(self):
         if not hasattr(self, '_cam_connected'):
             return
@@ -766,28 +1228,57 @@ class PhotoApp(MDApp):
         prev = self._get_cam_widget()
         if prev is None:
             self._notify("Camera not ready"); return
-        temp_dir = os.path.join(self.user_data_dir, "temp_captures")
-        os.makedirs(temp_dir, exist_ok=True)
-        self._cleanup_temp_files(temp_dir)
-        out = os.path.join(temp_dir, f"capture_{int(time.time())}.png")
+        out = os.path.join(self.user_data_dir, "temp_captures", f"capture_{int(time.time())}.png")
         def _do_capture(dt):
+            # keep the frame in memory; the PNG is only encoded if the user saves it
             try:
-                prev.export_to_png(out)
-                Clock.schedule_once(lambda dt2: self._verify_capture(out), 0.1)
+                core = prev.export_as_image()
             except Exception as e:
-                self._notify(f"Capture error: {e}")
+                self._notify(f"Capture error: {e}"); return
+            self._show_capture_preview(core, out)
         Clock.schedule_once(_do_capture, 0)
 
-    def _verify_capture(self, filepath):
-        if os.path.exists(filepath) and os.path.getsize(filepath) > 2000:
-            self._show_image_preview(filepath)
-        else:
+    def _materialize_capture(self) -> bool:
+        """Write a pending in-memory capture to _last_capture_path; True if there's a file to save."""
+        core = self._last_capture_core
+        path = self._last_capture_path
+        if core is None:
+            return bool(path and os.path.exists(path))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            core.save(path)
+        except Exception as e:
+            self._notify(f"Capture error: {e}"); return False
+        self._last_capture_core = None
+        if not self._verify_capture(path):
+            return False
+        self._track_temp_file(path)
+        return True
+
+    def _verify_capture(self, filepath) -> bool:
+        # one open: PNG signature from the header, size from fstat on the same fd
+        try:
+            with open(filepath, "rb") as f:
+                ok = f.read(8) == _PNG_MAGIC and os.fstat(f.fileno()).st_size > 2000
+        except FileNotFoundError:
             self._notify("Capture failed - please try again")
-            if os.path.exists(filepath):
-                os.remove(filepath)
+            return False
+        except OSError:
+            ok = False
+        if ok:
+            return True
+        self._notify("Capture failed - please try again")
+        try:
+            os.remove(filepath)
+        except OSError:
+            pass
+        return False
 
     # ---------- Video recording ----------
     def _start_video_recording(self):
+        # still recording, or the last OpenCV recording is flushing (_poll_rec_thread pending)
+        if self._is_recording or self._cv_thread is not None:
+            return
         prev = self._get_cam_widget()
         if prev and hasattr(prev, "start_recording"):
             vid_dir = os.path.join(self.user_data_dir, "temp_captures")
@@ -809,7 +1300,7 @@ class PhotoApp(MDApp):
             self._update_video_button_text()
             return
 
-        if not _HAS_CV2:
+        if _import_cv2() is None:
             self._notify("OpenCV not available; video recording unsupported on this backend.")
             return
 
@@ -820,10 +1311,11 @@ class PhotoApp(MDApp):
             ts = int(time.time())
             self._record_path = os.path.join(vid_dir, f"rec_{ts}.mp4")
 
-            self._cv_stop_flag = False
+            self._cv_stop_flag = stop = threading.Event()
             self._is_recording = True
             self._start_stopwatch()
-            self._cv_thread = threading.Thread(target=self._cv_record_worker, daemon=True)
+            self._cv_thread = threading.Thread(target=self._cv_record_worker,
+                                               args=(self._record_path, stop), daemon=True)
             self._cv_thread.start()
             self._notify("Recording (OpenCV)…")
             self._update_video_button_text()
@@ -831,42 +1323,121 @@ class PhotoApp(MDApp):
             self._notify(f"OpenCV video start failed: {e}")
             self._is_recording = False
             self._record_path = None
+            self._cv_thread = self._cv_stop_flag = None
             self._update_video_button_text()
 
-    def _cv_record_worker(self):
-        import cv2
+    def _cv_record_worker(self, path, stop):
+        """Runs off the UI thread; owns the capture and writer. UI updates go through Clock."""
+        cv2 = _import_cv2()
+        cv2.setNumThreads(1)  # one core for capture/encode, leave the rest to Kivy
         cap = cv2.VideoCapture(0)
         if not cap.isOpened():
-            self._notify("OpenCV could not open camera")
-            self._cv_stop_flag = True
-
-        fps = 20.0
+            cap.release()
+            Clock.schedule_once(lambda dt: self._cv_record_failed(stop, "OpenCV could not open camera"))
+            return
+        # one-frame driver queue: no burst of stale frames at the start of the file
+        # (returns False where the backend ignores it, which is harmless)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        # UVC cameras: compressed MJPG over the bus instead of raw YUV; set before FPS,
+        # which V4L2 validates against the current pixel format
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        code = int(cap.get(cv2.CAP_PROP_FOURCC))
+        Logger.info("OpenCV capture fourcc: " + "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)))
+
+        # ask the driver for 20 FPS and record at whatever it actually delivers, so
+        # playback speed matches real time; grab() then blocks at camera cadence
+        target_fps = 20.0
+        cap.set(cv2.CAP_PROP_FPS, target_fps)
+        cam_fps = cap.get(cv2.CAP_PROP_FPS)
+        if not 1 <= cam_fps <= 240:  # 0, -1 or junk from some backends
+            cam_fps = target_fps
+        # camera stuck faster than the target: keep every step-th frame
+        step = max(1, round(cam_fps / target_fps))
+        fps = cam_fps / step
         w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 640)
         h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 480)
-        fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-        writer = cv2.VideoWriter(self._record_path, fourcc, fps, (w, h))
-
-        t_last = time.time()
-        frame_interval = 1.0 / fps
-
-        while not self._cv_stop_flag:
-            now = time.time()
-            if now - t_last < frame_interval:
-                time.sleep(0.002); continue
-            t_last = now
-            ok, frame = cap.read()
-            if not ok:
-                break
-            writer.write(frame)
+        writer = _open_video_writer(cv2, path, fps, (w, h))
+        if writer is None:
+            cap.release()
+            Clock.schedule_once(lambda dt: self._cv_record_failed(stop, "No usable video encoder"))
+            return
 
+        # capture (this thread) and encode (below) overlap on separate cores, passing
+        # preallocated frame slots: free -> retrieve() into slot -> pending -> write -> free.
+        # With no free slot the oldest pending frame is dropped and its slot reused.
+        import numpy as np
+        free = deque(np.empty((h, w, 3), dtype=np.uint8) for _ in range(10))
+        pending = deque()
+        cond = threading.Condition()
+        capture_done = False
+
+        def _encode():
+            while True:
+                with cond:
+                    while not pending and not capture_done:
+                        cond.wait()
+                    if not pending:
+                        return  # capture finished and queue drained
+                    frame = pending.popleft()
+                try:
+                    writer.write(frame)
+                except Exception as e:
+                    enc_error.append(e)  # capture loop sees this and stops
+                    return
+                with cond:
+                    free.append(frame)
+
+        enc_error = []
+        encoder = threading.Thread(target=_encode, daemon=True)
+        encoder.start()
+
+        # always end the encoder and release the writer (which writes the MP4 index) and cap
+        err = None
+        n = 0
         try:
-            writer.release()
-        except Exception:
-            pass
-        try:
-            cap.release()
-        except Exception:
-            pass
+            while not stop.is_set() and not enc_error:
+                if not cap.grab():  # advance without decoding
+                    break
+                n += 1
+                if (n - 1) % step:
+                    continue  # skipped frames are never decoded
+                with cond:
+                    slot = free.popleft() if free else pending.popleft()
+                # decodes in place when the slot matches the frame size (else OpenCV
+                # allocates a new array, which then takes the slot's place in the pool)
+                try:
+                    ok, frame = cap.retrieve(slot)
+                except Exception:
+                    with cond:
+                        free.append(slot)  # keep the pool whole for the finally below
+                    raise
+                with cond:
+                    if not ok:
+                        free.append(slot)
+                        break
+                    pending.append(frame)
+                    cond.notify()
+        except Exception as e:
+            err = e
+        finally:
+            with cond:
+                capture_done = True
+                cond.notify()
+            encoder.join()
+            try:
+                writer.release()
+            except Exception:
+                pass
+            try:
+                cap.release()
+            except Exception:
+                pass
+
+        err = err or (enc_error[0] if enc_error else None)
+        if err is not None:
+            Logger.warning(f"OpenCV recording stopped: {err}")
+            # finish through the normal stop path (no-op if the user already stopped)
+            Clock.schedule_once(lambda dt: self._stop_video_recording())
 
     def _stop_video_recording(self):
         prev = self._get_cam_widget()
@@ -879,11 +1450,40 @@ class PhotoApp(MDApp):
             return
 
         if self._is_recording and self._cv_thread is not None:
-            self._cv_stop_flag = True
-            self._cv_thread.join(timeout=3.0)
-            self._cv_thread = None
+            stop = self._cv_stop_flag
+            if stop is None or stop.is_set():
+                return  # already stopping; _poll_rec_thread will finish up
+            stop.set()
+            # let the writer flush without blocking the UI: poll instead of join()
+            self._rec_stop_deadline = time.monotonic() + 3.0
+            Clock.schedule_interval(self._poll_rec_thread, 0.1)
+
+    def _poll_rec_thread(self, dt):
+        t = self._cv_thread
+        alive = t is not None and t.is_alive()
+        if alive and time.monotonic() < self._rec_stop_deadline:
+            return True
+        if self._is_recording:  # flushed, or gave up waiting: hand the file to the UI once
             self._finish_recording_common()
-            Clock.schedule_once(lambda dt: self.start_camera(), 0.2)
+        if alive:
+            return True  # still holds the camera/writer: keep blocking new recordings
+        self._cv_thread = None
+        self._cv_stop_flag = None
+        Clock.schedule_once(lambda dt: self.start_camera(), 0.2)
+        return False
+
+    def _cv_record_failed(self, stop, msg):
+        """The worker gave up before recording: undo what _start_video_recording set up."""
+        self._notify(msg)
+        if self._cv_stop_flag is not stop or stop.is_set():
+            return  # a stop is in progress (or done); _poll_rec_thread owns the cleanup
+        self._cv_thread = None
+        self._cv_stop_flag = None
+        self._is_recording = False
+        self._stop_stopwatch()
+        self._record_path = None
+        self._update_video_button_text()
+        Clock.schedule_once(lambda dt: self.start_camera(), 0.2)
 
     def _finish_recording_common(self):
         self._is_recording = False
@@ -891,20 +1491,25 @@ class PhotoApp(MDApp):
         path = self._record_path
         self._record_path = None
         self._update_video_button_text()
-        if not (path and os.path.exists(path) and os.path.getsize(path) > 0):
+        try:
+            size = os.stat(path).st_size if path else 0
+        except OSError:
+            size = 0
+        if size == 0:
             self._notify("Recording produced no file"); return
-        self._show_video_preview(path)
+        self._track_temp_file(path)
+        self._show_video_preview(path, size)
 
     # ---------- Stopwatch ----------
     def _start_stopwatch(self):
-        self._rec_start_ts = time.time()
+        self._rec_start_ts = time.monotonic()
         self._update_timer_label(0)
         if self._timer_ev is not None:
             try:
                 self._timer_ev.cancel()
             except Exception:
                 pass
-        self._timer_ev = Clock.schedule_interval(self._tick_stopwatch, 0.2)
+        self._timer_ev = Clock.schedule_once(self._tick_stopwatch, 1.0)
 
     def _stop_stopwatch(self):
         if self._timer_ev is not None:
@@ -916,8 +1521,11 @@ class PhotoApp(MDApp):
         self._update_timer_label(0)
 
     def _tick_stopwatch(self, dt):
-        elapsed = int(time.time() - self._rec_start_ts)
-        self._update_timer_label(elapsed)
+        # 1 Hz, re-aligned every tick to just past the next whole second so
+        # Clock jitter never shows a second late
+        elapsed = time.monotonic() - self._rec_start_ts
+        self._update_timer_label(int(elapsed))
+        self._timer_ev = Clock.schedule_once(self._tick_stopwatch, 1.0 - elapsed % 1.0 + 0.01)
 
     def _update_timer_label(self, secs):
         m = secs // 60
@@ -934,24 +1542,59 @@ class PhotoApp(MDApp):
         container.clear_widgets()
         container.add_widget(new_widget)
 
+    def _show_capture_preview(self, core, path):
+        """Show an in-memory capture by binding its texture directly; `path` is where Save writes it."""
+        self._last_capture_core = core
+        self._last_capture_path = path
+        self._preview_mode = "image"
+        img = self._preview_image_widget()
+        img.source = ""
+        # export_as_image renders flipped so its pixels save as an upright PNG: show it through
+        # a flipped region (shares the GPU texture), leaving core.texture as core.save() needs it
+        tex = core.texture
+        view = tex.get_region(0, 0, tex.width, tex.height)
+        view.flip_vertical()
+        img.texture = view
+        self.change_screen("preview")
+
     def _show_image_preview(self, path):
+        self._last_capture_core = None
         self._last_capture_path = path
         self._preview_mode = "image"
-        img = getattr(self.root, "ids", {}).get("preview_image")
-        if img is None:
-            img = AsyncImage(source=path, mipmap=True, nocache=False, allow_stretch=True, keep_ratio=True)
-            self._replace_preview_widget(img)
+        img = self._preview_image_widget()
+        if img.source == path:
+            img.reload()  # same file, possibly rewritten
         else:
             img.source = path
         self.change_screen("preview")
 
-    def _show_video_preview(self, video_path):
-        if not os.path.exists(video_path):
-            self._notify("Video file not found"); return
-        file_size = os.path.getsize(video_path)
+    def _preview_image_widget(self):
+        """The preview Image, put back into the container if a video preview replaced it."""
+        img = self._preview_img
+        if img is None:
+            img = getattr(self.root, "ids", {}).get("preview_image")
+            try:
+                img = img.__self__ if img is not None else None  # strong ref, not the ids proxy
+            except ReferenceError:
+                img = None
+            if img is None:
+                img = Image(mipmap=False, nocache=True, allow_stretch=True, keep_ratio=True)
+            self._preview_img = img
+        if img.parent is None:
+            self._replace_preview_widget(img)
+        return img
+
+    def _show_video_preview(self, video_path, file_size=None):
+        if file_size is None:  # callers that already stat'ed the file pass its size
+            try:
+                file_size = os.stat(video_path).st_size
+            except OSError:
+                self._notify("Video file not found"); return
         if file_size == 0:
             self._notify("Video file is empty"); return
 
+        self._preview_video_size = file_size
+        self._last_capture_core = None
         self._last_capture_path = video_path
         self._preview_mode = "video"
 
@@ -1024,7 +1667,13 @@ class PhotoApp(MDApp):
             layout.add_widget(icon)
 
         filename = os.path.basename(video_path)
-        file_size = os.path.getsize(video_path)
+        if video_path == self._last_capture_path:
+            file_size = self._preview_video_size  # stat'ed by _show_video_preview
+        else:
+            try:
+                file_size = os.stat(video_path).st_size
+            except OSError:
+                file_size = 0
         size_mb = file_size / (1024 * 1024)
 
         info_label = MDLabel(
@@ -1082,13 +1731,18 @@ class PhotoApp(MDApp):
             Logger.error(f"App resume error: {e}")
 
     def on_stop(self):
-        # stop playback if any
+        # a debounced profile save still pending would be lost on exit: run it now
+        self._flush_pending_profile_save()
+
+        # stop playback if any: the container holds a single preview widget; unload a
+        # Video explicitly (removal alone doesn't release its player), then detach
         try:
             container = getattr(self.root, "ids", {}).get("preview_container")
             if container and container.children:
-                for child in container.children:
-                    if hasattr(child, 'state'):
-                        child.state = 'stop'
+                child = container.children[0]
+                if isinstance(child, Video):
+                    child.unload()
+                container.clear_widgets()
         except Exception as e:
             Logger.warning(f"Video stop error: {e}")
 
@@ -1097,55 +1751,72 @@ class PhotoApp(MDApp):
                 self._stop_video_recording()
             except Exception as e:
                 Logger.warning(f"Recording stop error: {e}")
+        # exiting: the Clock poll won't run again, so give the writer its flush time here
+        if self._cv_thread is not None:
+            self._cv_thread.join(timeout=3.0)
 
         try:
             self.stop_camera()
         except Exception as e:
             Logger.warning(f"Camera stop error: {e}")
 
-        # Avoid misuse of Cache.remove(category) — if needed, let GC handle it.
-        try:
-            Cache.print_usage()
-        except Exception:
-            pass
+        for pool in (self._meta_pool, self._auth_pool, self._thumb_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=True)  # let queued history lines land
+        if self.store is not None:
+            self.store.close()
 
     # ---------- Temp files housekeeping ----------
+    def _track_temp_file(self, path):
+        """O(1) per capture: remember `path`, deleting whichever temp file falls out of the ring."""
+        ring = self._temp_ring
+        if len(ring) == ring.maxlen:
+            old = ring.popleft()
+            try:
+                os.remove(old); Logger.info(f"Cleaned: {old}")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                Logger.warning(f"Cleanup failed {old}: {e}")
+        ring.append(path)
+
     def _cleanup_temp_files(self, directory, keep_count=3):
+        """Full directory sweep; run once at startup (off the UI thread) for previous sessions' files."""
         try:
-            patterns = [os.path.join(directory, "capture_*.png"),
-                        os.path.join(directory, "capture_*.jpg"),
-                        os.path.join(directory, "rec_*.mp4")]
-            files = []
-            for pat in patterns:
-                files.extend(glob.glob(pat))
-            files.sort(key=os.path.getmtime, reverse=True)
-            for old_file in files[keep_count:]:
+            # one scandir pass and one stat per matching entry (DirEntry caches it)
+            with os.scandir(directory) as it:
+                files = [(e.stat().st_mtime, e.path) for e in it
+                         if (e.name.startswith("capture_") and e.name.endswith((".png", ".jpg"))
+                             or e.name.startswith("rec_") and e.name.endswith(".mp4"))
+                         and e.is_file()]
+            files.sort(reverse=True)
+            for _, old_file in files[keep_count:]:
                 try:
                     os.remove(old_file); Logger.info(f"Cleaned: {old_file}")
                 except Exception as e:
                     Logger.warning(f"Cleanup failed {old_file}: {e}")
+        except FileNotFoundError:
+            pass  # nothing captured yet
         except Exception as e:
             Logger.warning(f"Temp cleanup error: {e}")
 
     # ---------- Profile (per-mobile storage via LocalStore) ----------
     def _collect_profile_from_ui(self):
         ids = getattr(self.root, "ids", {})
-        tf = lambda k: (ids.get(k).text.strip() if ids.get(k) and hasattr(ids.get(k), 'text') else "")
-        return {
-            "name": tf("tf_name"),
-            "mobile": tf("tf_mobile"),
-            "email": tf("tf_email"),
-            "state": tf("tf_state"),
-            "district": tf("tf_district"),
-            "address": tf("tf_address"),
-        }
+        out = {}
+        for wid, key in _PROFILE_FIELDS:
+            w = ids.get(wid)
+            out[key] = w.text.strip() if w is not None and hasattr(w, "text") else ""
+        return out
 
     def _validate_profile(self, p: dict):
         if not p["name"]:
             return False, "Name is required"
-        if p["mobile"] and not re.fullmatch(r"[0-9]{10}", p["mobile"]):
+        if p["mobile"] and not _MOBILE_RE.fullmatch(p["mobile"]):
             return False, "Mobile must be 10 digits"
-        if p["email"] and not re.fullmatch(r"[^@]+@[^@]+\.[^@]+", p["email"]):
+        if p["email"] and not _EMAIL_RE.fullmatch(p["email"]):
             return False, "Email format invalid"
         return True, ""
 
@@ -1154,22 +1825,35 @@ class PhotoApp(MDApp):
         ok, msg = self._validate_profile(p)
         if not ok:
             self._notify(msg); return
-        def _do_save(dt):
-            try:
-                self.profile_data.update(p)
-                mobile = (self.profile_data.get("mobile") or "").strip()
-                if re.fullmatch(r"[0-9]{10}", mobile):
-                    self.store.save_profile(mobile, self.profile_data)
-                self._bind_profile_to_ui()
-                self._notify("Profile saved")
-            except Exception as e:
-                self._notify(f"Profile save failed: {e}")
-        Clock.schedule_once(_do_save, 0.1)
+        # update in memory now; repeated saves within 0.3 s share one disk write of the
+        # last snapshot, taken here so a logout/user switch before the flush can't redirect it
+        self.profile_data.update(p)
+        mobile = (self.profile_data.get("mobile") or "").strip()
+        self._pending_profile_save = (mobile, dict(self.profile_data))
+        self._profile_save_trigger()
+
+    def _flush_pending_profile_save(self):
+        if self._profile_save_trigger.is_triggered:
+            self._profile_save_trigger.cancel()
+            self._flush_profile_save()
+
+    def _flush_profile_save(self, *_):
+        pending, self._pending_profile_save = self._pending_profile_save, None
+        if pending is None:
+            return
+        mobile, data = pending
+        try:
+            if _MOBILE_RE.fullmatch(mobile):
+                self.store.save_profile(mobile, data)
+            self._bind_profile_to_ui()
+            self._notify("Profile saved")
+        except Exception as e:
+            self._notify(f"Profile save failed: {e}")
 
     def _save_user_profile(self):
         """Persist current profile into users/<mobile>/profile.json."""
         mobile = (self.profile_data.get("mobile") or "").strip()
-        if not re.fullmatch(r"[0-9]{10}", mobile):
+        if not _MOBILE_RE.fullmatch(mobile):
             self._notify("Profile save skipped: invalid/missing mobile")
             return
         try:
@@ -1180,45 +1864,52 @@ class PhotoApp(MDApp):
             self._notify(f"Profile save failed: {e}")
 
     def reset_profile_view(self):
-        p = self.profile_data; ids = getattr(self.root, "ids", {})
-        if ids.get("tf_name"):     ids["tf_name"].text = p.get("name","")
-        if ids.get("tf_mobile"):   ids["tf_mobile"].text = p.get("mobile","")
-        if ids.get("tf_email"):    ids["tf_email"].text = p.get("email","")
-        if ids.get("tf_state"):    ids["tf_state"].text = p.get("state","")
-        if ids.get("tf_district"): ids["tf_district"].text = p.get("district","")
-        if ids.get("tf_address"):  ids["tf_address"].text = p.get("address","")
+        self._bind_profile_to_ui()
         self._notify("Form reset")
 
     def _hash_text(self, text: str) -> str:
-        try:
-            import hashlib
-            return hashlib.sha256((text or "").encode("utf-8")).hexdigest()[:12]
-        except Exception:
-            return "masked"
+        # 12-hex-char masking token; blake2s sized to exactly 6 bytes, no truncation
+        return hashlib.blake2s((text or "").encode("utf-8"), digest_size=6).hexdigest()
 
     def _write_login_history(self, user: dict, mobile_value: str):
+        # hashing + append run on the single I/O worker: ordered, and never on the UI thread
+        if self._io_pool is None:
+            self._append_login_history(mobile_value)
+        else:
+            self._io_pool.submit(self._append_login_history, mobile_value)
+
+    def _append_login_history(self, mobile_value: str):
         auth_dir = os.path.join(self.user_data_dir, "auth")
         os.makedirs(auth_dir, exist_ok=True)
         path = os.path.join(auth_dir, "login_history.csv")
-        is_new = not os.path.exists(path)
-        with open(path, "a", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            if is_new:
-                w.writerow(["ts_iso", "mobile_masked"])
-            w.writerow([time.strftime("%Y-%m-%d %H:%M:%S"), self._hash_text(mobile_value)])
+        # fields are a timestamp and a hex digest: no CSV quoting needed
+        line = f"{time.strftime(_TIME_FMT)},{self._hash_text(mobile_value)}\n".encode("utf-8")
+        try:
+            with open(path, "ab", buffering=0) as f:
+                if os.fstat(f.fileno()).st_size == 0:  # header on first write, no exists() race
+                    line = b"ts_iso,mobile_masked\n" + line
+                f.write(line)
+        except OSError as e:
+            Logger.warning(f"Login history write failed: {e}")
 
     def _bind_profile_to_ui(self):
+        # coalesced: any number of calls in one frame -> one pass over the widgets before the next draw
+        self._profile_update_trigger()
+
+    def _do_bind_profile_to_ui(self, *_):
         try:
             ids = getattr(self.root, "ids", {})
             p = self.profile_data
-            if ids.get("tf_name"):     ids["tf_name"].text = p.get("name", "")
-            if ids.get("tf_mobile"):   ids["tf_mobile"].text = p.get("mobile", "")
-            if ids.get("tf_email"):    ids["tf_email"].text = p.get("email", "")
-            if ids.get("tf_state"):    ids["tf_state"].text = p.get("state", "")
-            if ids.get("tf_district"): ids["tf_district"].text = p.get("district", "")
-            if ids.get("tf_address"):  ids["tf_address"].text = p.get("address", "")
-            if ids.get("lbl_name"):    ids["lbl_name"].text = p.get("name", "Your Name") or "Your Name"
-            if ids.get("lbl_mobile"):  ids["lbl_mobile"].text = p.get("mobile", "Add mobile") or "Add mobile"
+            for wid, key in _PROFILE_FIELDS:
+                w = ids.get(wid)
+                if w:
+                    w.text = p.get(key, "")
+            w = ids.get("lbl_name")
+            if w:
+                w.text = p.get("name", "Your Name") or "Your Name"
+            w = ids.get("lbl_mobile")
+            if w:
+                w.text = p.get("mobile", "Add mobile") or "Add mobile"
         except Exception:
             pass
 
@@ -1227,8 +1918,9 @@ class PhotoApp(MDApp):
         if not user:
             return
         mobile = (user.get("mobile") or "").strip()
-        if not re.fullmatch(r"[0-9]{10}", mobile):
+        if not _MOBILE_RE.fullmatch(mobile):
             return
+        self._flush_pending_profile_save()  # belongs to the previous user
         # Load/save profile.json INSIDE this user's folder via LocalStore
         self.profile_data = self.store.load_profile(mobile)
         self._bind_profile_to_ui()
@@ -1236,10 +1928,20 @@ class PhotoApp(MDApp):
     # ---------- Utils ----------
     def _notify(self, msg: str):
         Logger.info(f"PhotoApp: {msg}")
+        if platform in ('android', 'ios') or len(msg) >= 60:
+            return
+        # at most one WM title change per 0.5 s; a burst ends with its last message shown
+        self._pending_title = f"Photo App — {msg}"
+        if time.monotonic() - self._last_title_ts >= 0.5:
+            self._apply_title()
+        else:
+            self._title_trigger()
+
+    def _apply_title(self, *_):
+        self._last_title_ts = time.monotonic()
         try:
-            if platform not in ('android', 'ios') and hasattr(Window, "set_title"):
-                if len(msg) < 60:
-                    Window.set_title(f"Photo App — {msg}")
+            if hasattr(Window, "set_title"):
+                Window.set_title(self._pending_title)
         except Exception:
             pass
 